@@ -0,0 +1,151 @@
+"""
+Numba Kernels - Optional JIT-compiled numeric kernels for hot loops.
+
+Numba is not a hard dependency. Each kernel is a plain Python loop; its
+`_nb` JIT copy is None when numba is missing, and callers then use the
+vectorized NumPy fallback defined next to it.
+"""
+
+from typing import List, Tuple
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; the NumPy paths are used without it
+    njit = None
+    prange = range
+
+
+def stack_tails(arrays: List[np.ndarray], window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stack the last `window` values of each array into an (N, window) float
+    matrix, right-aligned and NaN-padded, plus the original lengths.
+    """
+    out = np.full((len(arrays), window), np.nan)
+    lengths = np.empty(len(arrays), dtype=np.int64)
+    for i, values in enumerate(arrays):
+        tail = values[-window:]
+        out[i, window - len(tail):] = tail
+        lengths[i] = len(values)
+    return out, lengths
+
+
+def _score_universe_loop(close2d, vol2d, lengths):
+    n, window = close2d.shape
+    accumulation = np.empty(n)
+    trigger = np.empty(n)
+    for i in prange(n):
+        if lengths[i] < window:
+            accumulation[i] = 50.0
+            trigger[i] = 50.0
+            continue
+
+        recent_volume = np.nanmean(vol2d[i, -5:])
+        avg_volume = np.nanmean(vol2d[i])
+        volume_ratio = recent_volume / avg_volume if avg_volume > 0 else 1.0
+        accumulation[i] = min(volume_ratio * 30 + 40, 100.0)
+
+        current_price = close2d[i, -1]
+        sma = np.nanmean(close2d[i])
+        if current_price > sma * 1.02:
+            trigger[i] = 85.0
+        elif current_price > sma:
+            trigger[i] = 65.0
+        else:
+            trigger[i] = 35.0
+    return accumulation, trigger
+
+
+_score_universe_nb = njit(cache=True, parallel=True)(_score_universe_loop) if njit else None
+
+
+def _score_universe_np(close2d, vol2d, lengths):
+    n, window = close2d.shape
+    accumulation = np.full(n, 50.0)
+    trigger = np.full(n, 50.0)
+    full = lengths >= window
+    if not full.any():
+        return accumulation, trigger
+
+    vol = vol2d[full]
+    recent_volume = np.nanmean(vol[:, -5:], axis=1)
+    avg_volume = np.nanmean(vol, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        volume_ratio = np.where(avg_volume > 0, recent_volume / avg_volume, 1.0)
+    accumulation[full] = np.minimum(volume_ratio * 30 + 40, 100.0)
+
+    close = close2d[full]
+    current_price = close[:, -1]
+    sma = np.nanmean(close, axis=1)
+    trigger[full] = np.select(
+        [current_price > sma * 1.02, current_price > sma],
+        [85.0, 65.0],
+        default=35.0
+    )
+    return accumulation, trigger
+
+
+def score_universe(close2d: np.ndarray, vol2d: np.ndarray,
+                   lengths: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Accumulation and trigger scores for every row of stacked windows.
+
+    Mirrors PaperTradingEngine's per-symbol scoring: symbols with fewer
+    bars than the window width score a neutral 50 on both.
+    """
+    if _score_universe_nb is not None:
+        return _score_universe_nb(close2d, vol2d, lengths)
+    return _score_universe_np(close2d, vol2d, lengths)
+
+
+def _sma_and_slope_loop(close, period, lookback):
+    n = len(close)
+    sma = np.full(n, np.nan)
+    slope = np.full(n, np.nan)
+    s = 0.0
+    missing = 0
+    for i in range(n):
+        if np.isnan(close[i]):
+            missing += 1
+        else:
+            s += close[i]
+        if i >= period:
+            if np.isnan(close[i - period]):
+                missing -= 1
+            else:
+                s -= close[i - period]
+        if i >= period - 1 and missing == 0:
+            sma[i] = s / period
+        if i >= period - 1 + lookback:
+            slope[i] = (sma[i] - sma[i - lookback]) / lookback
+    return sma, slope
+
+
+_sma_and_slope_nb = njit(cache=True)(_sma_and_slope_loop) if njit else None
+
+
+def _sma_and_slope_np(close, period, lookback):
+    n = len(close)
+    sma = np.full(n, np.nan)
+    if 0 < period <= n:
+        windows = np.lib.stride_tricks.sliding_window_view(close, period)
+        sma[period - 1:] = windows.mean(axis=1)
+    slope = np.full(n, np.nan)
+    if 0 < lookback < n:
+        slope[lookback:] = (sma[lookback:] - sma[:-lookback]) / lookback
+    return sma, slope
+
+
+def sma_and_slope(close: np.ndarray, period: int,
+                  lookback: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Trailing SMA of `close` and its slope over `lookback` bars.
+
+    The JIT kernel keeps a running window sum, so each close is read once
+    instead of once per rolling mean, shift and subtraction. Windows with a
+    NaN close give a NaN SMA, as pandas rolling(period).mean() does.
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    if _sma_and_slope_nb is not None:
+        return _sma_and_slope_nb(close, period, lookback)
+    return _sma_and_slope_np(close, period, lookback)
@@ -17,17 +17,21 @@ class AccumulationAgent:
     @staticmethod
     def calculate_volume_absorption(df: pd.DataFrame, lookback: int = 20) -> Tuple[bool, float]:
         """Detect volume absorption - high volume with minimal price movement"""
-        recent_data = df.tail(lookback)
+        volume = df['volume'].to_numpy()
         
         # High volume relative to average
-        avg_volume = recent_data['volume'].mean()
-        current_volume = df['volume'].iloc[-1]
+        avg_volume = np.nanmean(volume[-lookback:])
+        current_volume = volume[-1]
         volume_ratio = current_volume / avg_volume if avg_volume > 0 else 0
         
-        # Low price volatility despite high volume
-        price_range = (recent_data['high'] - recent_data['low']) / recent_data['close']
-        avg_range = price_range.mean()
-        current_range = price_range.iloc[-1]
+        # Low price volatility despite high volume; the range is computed once
+        # over the window and the current bar is its last element
+        high = df['high'].to_numpy()[-lookback:]
+        low = df['low'].to_numpy()[-lookback:]
+        close = df['close'].to_numpy()[-lookback:]
+        price_range = (high - low) / close
+        avg_range = np.nanmean(price_range)
+        current_range = price_range[-1]
         
         # Volume absorption: high volume + low volatility
         absorption = volume_ratio > 1.3 and current_range < avg_range * 0.8
@@ -55,16 +59,18 @@ class AccumulationAgent:
     @staticmethod
     def calculate_tight_base(df: pd.DataFrame, lookback: int = 15) -> Tuple[bool, float]:
         """Detect tight base - price consolidation near highs"""
-        recent_data = df.tail(lookback)
+        # Slice the trailing window off raw arrays rather than df.tail() Series
+        recent_high = np.nanmax(df['high'].to_numpy()[-lookback:])
+        recent_low = np.nanmin(df['low'].to_numpy()[-lookback:])
+        close = df['close'].to_numpy()
         
         # Price range compression
-        high_low_range = (recent_data['high'].max() - recent_data['low'].min())
-        avg_close = recent_data['close'].mean()
+        high_low_range = recent_high - recent_low
+        avg_close = np.nanmean(close[-lookback:])
         range_pct = high_low_range / avg_close if avg_close > 0 else 0
         
         # Close to recent highs
-        recent_high = recent_data['high'].max()
-        current_close = df['close'].iloc[-1]
+        current_close = close[-1]
         proximity_to_high = current_close / recent_high if recent_high > 0 else 0
         
         # Tight base: small range + near highs
@@ -79,13 +85,15 @@ class AccumulationAgent:
             return False, 0.0
         
         # Stock performance
-        stock_start = df['close'].iloc[-lookback]
-        stock_end = df['close'].iloc[-1]
+        close = df['close'].to_numpy()
+        stock_start = close[-lookback]
+        stock_end = close[-1]
         stock_return = (stock_end / stock_start - 1) if stock_start > 0 else 0
         
         # Sector performance (assuming sector data has same date alignment)
-        sector_start = sector_df['sector_close'].iloc[-lookback]
-        sector_end = sector_df['sector_close'].iloc[-1]
+        sector_close = sector_df['sector_close'].to_numpy()
+        sector_start = sector_close[-lookback]
+        sector_end = sector_close[-1]
         sector_return = (sector_end / sector_start - 1) if sector_start > 0 else 0
         
         # Relative strength
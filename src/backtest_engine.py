@@ -8,8 +8,12 @@ and maintains a complete trade log without lookahead bias.
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
+import logging
+import numpy as np
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class Trade:
@@ -25,6 +29,29 @@ class Trade:
     exit_reason: str = ""
 
 
+@dataclass
+class TradeArrays:
+    """Columnar (one array per field) view of a trade log for vectorized analysis."""
+    symbol: np.ndarray
+    entry_date: np.ndarray
+    pnl: np.ndarray
+    pnl_pct: np.ndarray
+    
+    @classmethod
+    def from_trades(cls, trades: List[Trade]) -> 'TradeArrays':
+        """Build the columnar layout from Trade records in one pass."""
+        n = len(trades)
+        return cls(
+            symbol=np.array([t.symbol for t in trades], dtype=object),
+            entry_date=np.array([t.entry_date for t in trades], dtype=object),
+            pnl=np.fromiter((t.pnl for t in trades), dtype=float, count=n),
+            pnl_pct=np.fromiter((t.pnl_pct for t in trades), dtype=float, count=n)
+        )
+    
+    def __len__(self) -> int:
+        return len(self.pnl)
+
+
 @dataclass
 class Position:
     """Active position record."""
@@ -82,8 +109,8 @@ class BacktestEngine:
         daily_data = price_data.groupby('date')
         dates = sorted(price_data['date'].unique())
         
-        print(f"Starting backtest: {dates[0]} to {dates[-1]}")
-        print(f"Initial capital: ${self.initial_capital:,.0f}")
+        logger.debug("Starting backtest: %s to %s, initial capital: $%.0f",
+                     dates[0], dates[-1], self.initial_capital)
         
         for i, date in enumerate(dates):
             self.current_date = date
@@ -105,9 +132,10 @@ class BacktestEngine:
             # Step 4: Update position values and equity curve
             self._update_equity_curve(day_data)
             
-            if i % 50 == 0:  # Progress update
+            # Progress update; skipped entirely (including the valuation) unless enabled
+            if i % 50 == 0 and logger.isEnabledFor(logging.DEBUG):
                 total_value = self._calculate_total_value(day_data)
-                print(f"Date: {date}, Portfolio Value: ${total_value:,.0f}")
+                logger.debug("Date: %s, Portfolio Value: $%.0f", date, total_value)
         
         return self._generate_results()
     
@@ -315,28 +343,30 @@ class BacktestEngine:
     def _generate_results(self) -> Dict:
         """Generate final backtest results."""
         if not self.equity_curve:
-            return {'trades': [], 'equity_curve': [], 'metrics': {}}
+            return {'trades': [], 'trade_arrays': TradeArrays.from_trades([]), 'equity_curve': [], 'metrics': {}}
         
         final_value = self.equity_curve[-1]['total_value']
         total_return = ((final_value - self.initial_capital) / self.initial_capital) * 100
         
-        # Calculate basic metrics
-        winning_trades = [t for t in self.trades if t.pnl > 0]
-        losing_trades = [t for t in self.trades if t.pnl < 0]
+        # Calculate basic metrics on the columnar trade log
+        trade_arrays = TradeArrays.from_trades(self.trades)
+        winning_pnls = trade_arrays.pnl[trade_arrays.pnl > 0]
+        losing_pnls = trade_arrays.pnl[trade_arrays.pnl < 0]
         
         metrics = {
             'total_return_pct': round(total_return, 2),
             'final_value': round(final_value, 2),
             'total_trades': len(self.trades),
-            'winning_trades': len(winning_trades),
-            'losing_trades': len(losing_trades),
-            'win_rate_pct': round(len(winning_trades) / max(len(self.trades), 1) * 100, 1),
-            'avg_win': round(sum(t.pnl for t in winning_trades) / max(len(winning_trades), 1), 2),
-            'avg_loss': round(sum(t.pnl for t in losing_trades) / max(len(losing_trades), 1), 2),
+            'winning_trades': len(winning_pnls),
+            'losing_trades': len(losing_pnls),
+            'win_rate_pct': round(len(winning_pnls) / max(len(self.trades), 1) * 100, 1),
+            'avg_win': round(float(winning_pnls.sum()) / max(len(winning_pnls), 1), 2),
+            'avg_loss': round(float(losing_pnls.sum()) / max(len(losing_pnls), 1), 2),
         }
         
         return {
             'trades': self.trades,
+            'trade_arrays': trade_arrays,
             'equity_curve': self.equity_curve,
             'signal_log': self.signal_log,
             'metrics': metrics
@@ -6,8 +6,45 @@ that force disciplined position management and capital recycling.
 """
 
 from typing import Dict, Optional
+import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the NumPy path is used without it
+    njit = None
+
+
+def _decay_components_loop(age, current, prev, sector_rel, grace_days, time_rate,
+                           stagnation_threshold, stagnation_decay, sector_rate):
+    """Time, stagnation and sector decay per position in one pass"""
+    n = len(age)
+    time_decay = np.zeros(n)
+    stagnation = np.zeros(n)
+    sector_decay = np.zeros(n)
+    for i in range(n):
+        if age[i] > grace_days:
+            time_decay[i] = (age[i] - grace_days) * time_rate
+        if prev[i] != 0 and abs((current[i] - prev[i]) / prev[i]) < stagnation_threshold:
+            stagnation[i] = stagnation_decay
+        if sector_rel[i] < -1.0:
+            sector_decay[i] = sector_rate
+    return time_decay, stagnation, sector_decay
+
+
+def _decay_components_np(age, current, prev, sector_rel, grace_days, time_rate,
+                         stagnation_threshold, stagnation_decay, sector_rate):
+    """Vectorized fallback for _decay_components_loop"""
+    time_decay = np.where(age > grace_days, (age - grace_days) * time_rate, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        move = np.abs((current - prev) / prev)
+    stagnation = np.where((prev != 0) & (move < stagnation_threshold), stagnation_decay, 0.0)
+    sector_decay = np.where(sector_rel < -1.0, sector_rate, 0.0)
+    return time_decay, stagnation, sector_decay
+
+
+_decay_components_nb = njit(cache=True)(_decay_components_loop) if njit else None
+
 
 class ConfidenceDecay:
     """
@@ -140,6 +177,18 @@ class ConfidenceDecay:
         
         return 0.0
     
+    @staticmethod
+    def _decay_components(age: np.ndarray, current: np.ndarray, prev: np.ndarray,
+                          sector_rel: np.ndarray) -> tuple:
+        """Time, stagnation and sector decay arrays for a batch of positions."""
+        kernel = _decay_components_nb if _decay_components_nb is not None else _decay_components_np
+        return kernel(
+            age, current, prev, sector_rel,
+            ConfidenceDecay.GRACE_PERIOD_DAYS, ConfidenceDecay.TIME_DECAY_RATE,
+            ConfidenceDecay.STAGNATION_THRESHOLD, ConfidenceDecay.STAGNATION_DECAY,
+            ConfidenceDecay.SECTOR_DECAY_RATE
+        )
+    
     @staticmethod
     def batch_decay(df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -153,22 +202,44 @@ class ConfidenceDecay:
         Returns:
             DataFrame with added decay columns
         """
-        results = []
+        # Same rules as decay_confidence, applied to whole columns at once
+        age = df['position_age_days'].to_numpy(dtype=float)
+        entry = df['entry_price'].to_numpy(dtype=float)
+        current = df['current_price'].to_numpy(dtype=float)
+        prev = df['price_5_days_ago'].to_numpy(dtype=float)
+        sector_rel = (
+            df['sector_performance_5d'].to_numpy(dtype=float)
+            - df['market_performance_5d'].to_numpy(dtype=float)
+        )
         
-        for _, row in df.iterrows():
-            decay_info = ConfidenceDecay.decay_confidence(
-                initial_confidence=row['initial_confidence'],
-                position_age_days=row['position_age_days'],
-                entry_price=row['entry_price'],
-                current_price=row['current_price'],
-                price_5_days_ago=row['price_5_days_ago'],
-                sector_performance_5d=row['sector_performance_5d'],
-                market_performance_5d=row['market_performance_5d']
+        time_decay, stagnation_decay, sector_decay = ConfidenceDecay._decay_components(
+            age, current, prev, sector_rel
+        )
+        
+        total_decay = time_decay + stagnation_decay + sector_decay
+        decayed = np.fmax(0.0, df['initial_confidence'].to_numpy(dtype=float) - total_decay)
+        pnl_pct = ((current - entry) / entry) * 100
+        
+        decay_factors = [
+            {
+                name: value
+                for name, value in (
+                    ('time_decay', time), ('stagnation_decay', stagnation), ('sector_decay', sector)
+                )
+                if value > 0
+            }
+            for time, stagnation, sector in zip(
+                time_decay.tolist(), stagnation_decay.tolist(), sector_decay.tolist()
             )
-            
-            results.append(decay_info)
+        ]
         
-        result_df = pd.DataFrame(results)
+        result_df = pd.DataFrame({
+            'decayed_confidence': [round(value, 1) for value in decayed.tolist()],
+            'total_decay': [round(value, 1) for value in total_decay.tolist()],
+            'decay_factors': decay_factors,
+            'force_exit': decayed < ConfidenceDecay.MIN_CONFIDENCE,
+            'current_pnl_pct': [round(value, 1) for value in pnl_pct.tolist()]
+        }, index=df.index)
         return pd.concat([df, result_df], axis=1)
     
     @staticmethod
@@ -6,6 +6,7 @@ price movements while protecting against adverse moves.
 """
 
 from typing import Dict, Optional
+import numpy as np
 import pandas as pd
 
 
@@ -135,6 +136,10 @@ class ExitEngine:
         """
         Update exit levels for multiple positions.
         
+        Vectorized equivalent of calling update() per row: trend strength is
+        bucketed with np.digitize and k-factors are chosen with np.select, so
+        no Python-level branching happens per position.
+        
         Args:
             df: DataFrame with columns: current_price, entry_price, current_atr, 
                 sma20, existing_stop (optional), position_age_days (optional)
@@ -142,25 +147,79 @@ class ExitEngine:
         Returns:
             DataFrame with added exit management columns
         """
-        results = []
+        current_price = df['current_price'].to_numpy(dtype=float)
+        entry_price = df['entry_price'].to_numpy(dtype=float)
+        current_atr = df['current_atr'].to_numpy(dtype=float)
+        sma20 = df['sma20'].to_numpy(dtype=float)
         
-        for _, row in df.iterrows():
-            existing_stop = row.get('existing_stop', None)
-            position_age = row.get('position_age_days', 0)
-            
-            exit_info = ExitEngine.update(
-                current_price=row['current_price'],
-                entry_price=row['entry_price'],
-                current_atr=row['current_atr'],
-                sma20=row['sma20'],
-                existing_stop=existing_stop,
-                position_age_days=position_age
-            )
-            
-            results.append(exit_info)
+        if 'existing_stop' in df.columns:
+            existing_stop = df['existing_stop'].to_numpy(dtype=float)
+        else:
+            existing_stop = np.full(len(df), np.nan)
+        
+        if 'position_age_days' in df.columns:
+            position_age = df['position_age_days'].fillna(0).to_numpy()
+        else:
+            position_age = np.zeros(len(df))
         
-        result_df = pd.DataFrame(results)
-        return pd.concat([df, result_df], axis=1)
+        # Step 1: Trend strength index (0=weak, 1=normal, 2=strong)
+        trend_idx = ExitEngine._trend_strength_index(current_price, sma20)
+        trend_strength = np.array(['weak', 'normal', 'strong'])[trend_idx]
+        
+        # Step 2: k-factor, mirroring _select_k_factor
+        k_by_trend = np.array([
+            ExitEngine.K_FACTORS['tight'],
+            ExitEngine.K_FACTORS['normal'],
+            ExitEngine.K_FACTORS['wide']
+        ])
+        base_k = k_by_trend[trend_idx]
+        k_factor = np.select(
+            [
+                (position_age >= 10) & (trend_idx == 2),
+                (position_age >= 5) & (trend_idx >= 1)
+            ],
+            [
+                ExitEngine.K_FACTORS['wide'],
+                np.maximum(base_k, ExitEngine.K_FACTORS['normal'])
+            ],
+            default=base_k
+        )
+        
+        # Step 3: Initial stop where no existing stop, otherwise trail
+        atr_distance = k_factor * current_atr
+        has_stop = ~np.isnan(existing_stop)
+        initial_stop = entry_price - atr_distance
+        trailing_stop = np.fmax(existing_stop, current_price - atr_distance)
+        new_stop = np.where(has_stop, trailing_stop, initial_stop)
+        stop_type = np.where(
+            has_stop,
+            np.where(new_stop > existing_stop, 'trailing', 'held'),
+            'initial'
+        )
+        
+        return df.assign(
+            stop_price=np.round(new_stop, 2),
+            k_factor=k_factor,
+            trend_strength=trend_strength,
+            stop_type=stop_type,
+            atr_distance=np.round(atr_distance, 2),
+            profit_loss_pct=np.round((current_price - entry_price) / entry_price * 100, 1)
+        )
+    
+    @staticmethod
+    def _trend_strength_index(current_price: np.ndarray, sma20: np.ndarray) -> np.ndarray:
+        """
+        Vectorized trend strength bucketing.
+        
+        Returns: int array with 0='weak', 1='normal', 2='strong'. right=True keeps
+        the inclusive upper bounds used by _assess_trend_strength.
+        """
+        price_vs_sma = np.abs((current_price - sma20) / sma20)
+        bins = np.array([
+            ExitEngine.TREND_THRESHOLDS['weak'],
+            ExitEngine.TREND_THRESHOLDS['normal']
+        ])
+        return np.digitize(price_vs_sma, bins, right=True)
     
     @staticmethod
     def is_stopped_out(current_price: float, stop_price: float) -> bool:
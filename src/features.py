@@ -1,43 +1,102 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional
+
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+def _as_arrays(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Pull the OHLCV columns out of a frame once as contiguous float arrays"""
+    return {c: df[c].to_numpy(dtype=float) for c in OHLCV_COLUMNS if c in df.columns}
+
+
+def _rolling_mean(values: np.ndarray, period: int) -> np.ndarray:
+    """Trailing mean over `period` bars, NaN until the window is full"""
+    out = np.full(len(values), np.nan)
+    if len(values) >= period:
+        windows = np.lib.stride_tricks.sliding_window_view(values, period)
+        out[period - 1:] = windows.mean(axis=1)
+    return out
+
 
 class FeatureComputer:
     """Compute technical features with no lookahead bias"""
-    
+
+    @staticmethod
+    def atr_array(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                  period: int = 14) -> np.ndarray:
+        """Average True Range on raw arrays"""
+        prev_close = np.concatenate(([np.nan], close[:-1]))
+
+        tr1 = high - low
+        tr2 = np.abs(high - prev_close)
+        tr3 = np.abs(low - prev_close)
+
+        # fmax skips the NaN previous close on the first bar, like DataFrame.max
+        true_range = np.fmax(tr1, np.fmax(tr2, tr3))
+        return _rolling_mean(true_range, period)
+
+    @staticmethod
+    def rvol_array(volume: np.ndarray, period: int = 20) -> np.ndarray:
+        """Relative Volume on a raw volume array"""
+        avg_volume = _rolling_mean(volume, period)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return volume / avg_volume
+
     @staticmethod
     def atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
         """Average True Range - volatility measure"""
-        high = df['high']
-        low = df['low'] 
-        close = df['close'].shift(1)
-        
-        tr1 = high - low
-        tr2 = abs(high - close)
-        tr3 = abs(low - close)
-        
-        true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        return true_range.rolling(window=period).mean()
-    
+        arrays = _as_arrays(df)
+        values = FeatureComputer.atr_array(arrays['high'], arrays['low'], arrays['close'], period)
+        return pd.Series(values, index=df.index)
+
     @staticmethod
     def sma(series: pd.Series, period: int) -> pd.Series:
         """Simple Moving Average - trend direction"""
-        return series.rolling(window=period).mean()
-    
+        values = _rolling_mean(series.to_numpy(dtype=float), period)
+        return pd.Series(values, index=series.index, name=series.name)
+
     @staticmethod
     def rvol(df: pd.DataFrame, period: int = 20) -> pd.Series:
         """Relative Volume - current vs average volume"""
-        avg_volume = df['volume'].rolling(window=period).mean()
-        return df['volume'] / avg_volume
-    
+        values = FeatureComputer.rvol_array(df['volume'].to_numpy(dtype=float), period)
+        return pd.Series(values, index=df.index)
+
+    @classmethod
+    def compute_arrays(cls, arrays: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Compute all features from the dict produced by _as_arrays"""
+        return {
+            'atr_14': cls.atr_array(arrays['high'], arrays['low'], arrays['close'], 14),
+            'sma_20': _rolling_mean(arrays['close'], 20),
+            'sma_50': _rolling_mean(arrays['close'], 50),
+            'rvol_20': cls.rvol_array(arrays['volume'], 20)
+        }
+
     @classmethod
     def compute_all(cls, df: pd.DataFrame) -> pd.DataFrame:
         """Compute all features for a stock's data"""
-        result = df.copy()
+        return df.assign(**cls.compute_arrays(_as_arrays(df)))
+
+    @classmethod
+    def compute_universe(cls, df: pd.DataFrame, max_workers: Optional[int] = None) -> pd.DataFrame:
+        """
+        Compute all features per symbol for a multi-symbol frame.
+        
+        Rows are expected in date order within each symbol. Symbols are
+        independent and the kernels run in NumPy (which releases the GIL), so
+        they are dispatched to a thread pool and merged on the calling thread.
+        """
+        arrays = _as_arrays(df)
+        positions = df.groupby('symbol', sort=False, observed=True).indices
+        
+        def _process_symbol(idx: np.ndarray):
+            return idx, cls.compute_arrays({c: values[idx] for c, values in arrays.items()})
         
-        result['atr_14'] = cls.atr(df, 14)
-        result['sma_20'] = cls.sma(df['close'], 20)
-        result['sma_50'] = cls.sma(df['close'], 50)
-        result['rvol_20'] = cls.rvol(df, 20)
+        columns: Dict[str, np.ndarray] = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for idx, features in pool.map(_process_symbol, positions.values()):
+                for name, values in features.items():
+                    columns.setdefault(name, np.full(len(df), np.nan))[idx] = values
         
-        return result
\ No newline at end of file
+        return df.assign(**columns)
@@ -17,6 +17,14 @@ class Decision(Enum):
     EXIT = "EXIT"
 
 
+# Approval reason text shared by the entry and exit paths
+_ENTRY_APPROVED = "Entry approved: All risk checks passed"
+_EXIT_APPROVED = "Exit approved: Exit conditions satisfied"
+
+# Exit approval with no P&L or confidence detail is always the same tuple
+_EXIT_OK = (Decision.EXIT, _EXIT_APPROVED)
+
+
 class Governor:
     """
     Governor Agent with three key responsibilities:
@@ -156,11 +164,11 @@ class Governor:
                 return Decision.NO_TRADE, f"Sector exposure violation: {sector_check}"
         
         # All checks passed
-        reasons.append("All risk checks passed")
-        reasons.append(f"Confidence: {confidence:.1f}%")
-        reasons.append(f"Position size: {size} shares")
+        details = f"Confidence: {confidence:.1f}%, Position size: {size} shares"
+        if reasons:
+            return Decision.ENTER, f"Entry approved: {', '.join(reasons)}, All risk checks passed, {details}"
         
-        return Decision.ENTER, f"Entry approved: {', '.join(reasons)}"
+        return Decision.ENTER, f"{_ENTRY_APPROVED}, {details}"
     
     @staticmethod
     def _process_exit_signal(
@@ -179,7 +187,10 @@ class Governor:
         if pnl_pct is not None and pnl_pct < -Governor.MAX_DRAWDOWN * 100:
             return Decision.EXIT, f"Force exit: Drawdown {pnl_pct:.1f}% exceeds limit"
         
-        # Standard exit conditions met
+        # Standard exit conditions met; only format when there is detail to add
+        if not reasons and pnl_pct is None and decayed_confidence is None:
+            return _EXIT_OK
+        
         reasons.append("Exit conditions satisfied")
         if pnl_pct is not None:
             reasons.append(f"P&L: {pnl_pct:.1f}%")
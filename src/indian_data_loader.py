@@ -5,13 +5,51 @@ Supports multiple Indian data sources including Yahoo Finance (.NS/.BO),
 NSE API, and CSV files with Indian market conventions.
 """
 
+import numpy as np
 import pandas as pd
-import yfinance as yf
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
 from typing import Dict, List, Optional, Union
 from datetime import datetime, timedelta
+import functools
+import logging
 import os
 
-from indian_market_config import IndianDataValidator, IndianSectorMapper, is_indian_trading_day
+from indian_market_config import (
+    INDIAN_INDICES, IndianDataValidator, IndianSectorMapper, indian_trading_day_mask
+)
+
+logger = logging.getLogger(__name__)
+
+# Yahoo downloads are I/O bound; yf.download uses this many threads per batch
+YAHOO_MAX_WORKERS = 16
+
+# On-disk history cache; entries older than this are downloaded again
+YAHOO_CACHE_DIR = "data/yahoo_cache"
+YAHOO_CACHE_MAX_AGE = timedelta(days=1)
+
+# Local per-symbol files; a .parquet next to the .csv is preferred when present
+LOCAL_DATA_DIR = "data/indian_stocks"
+LOCAL_COLUMNS = ('date', 'open', 'high', 'low', 'close', 'volume')
+
+# Column order of frames returned by the Yahoo loader
+YAHOO_COLUMNS = ('date', 'symbol', 'open', 'high', 'low', 'close', 'volume', 'sector')
+
+
+def _session_dates(index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    """Trading-session dates of a Yahoo history index as naive datetime64."""
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.normalize()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_ticker(yahoo_symbol: str):
+    """Reuse one Ticker object per Yahoo symbol for the process lifetime."""
+    # yfinance is slow to import and only needed for Yahoo downloads
+    import yfinance as yf
+    return yf.Ticker(yahoo_symbol)
 
 class IndianDataLoader:
     """
@@ -19,14 +57,16 @@ class IndianDataLoader:
     Handles NSE/BSE symbols, Indian date formats, and market conventions.
     """
     
-    def __init__(self, data_source: str = "yahoo"):
+    def __init__(self, data_source: str = "yahoo", cache_dir: Optional[str] = YAHOO_CACHE_DIR):
         """
         Initialize Indian data loader.
         
         Args:
             data_source: 'yahoo', 'csv', or 'nse_api'
+            cache_dir: Directory for cached Yahoo history (None disables caching)
         """
         self.data_source = data_source
+        self.cache_dir = cache_dir
         self.sector_mapper = IndianSectorMapper()
     
     def load_stock_data(
@@ -46,7 +86,7 @@ class IndianDataLoader:
             exchange: 'NSE' or 'BSE'
             
         Returns:
-            DataFrame with columns: date, symbol, open, high, low, close, volume, sector
+            DataFrame with columns: date (datetime64), symbol, open, high, low, close, volume, sector
         """
         if self.data_source == "yahoo":
             return self._load_from_yahoo(symbols, start_date, end_date, exchange)
@@ -68,64 +108,67 @@ class IndianDataLoader:
         suffix = ".NS" if exchange == "NSE" else ".BO"
         yahoo_symbols = [f"{symbol}{suffix}" for symbol in symbols]
         
-        all_data = []
+        logger.info("Loading %d Indian stocks from Yahoo Finance...", len(symbols))
         
-        print(f"Loading {len(symbols)} Indian stocks from Yahoo Finance...")
+        # One batched download for everything not already cached
+        histories = self._load_histories(yahoo_symbols, start_date, end_date)
         
-        for i, (original_symbol, yahoo_symbol) in enumerate(zip(symbols, yahoo_symbols)):
-            try:
-                # Download data
-                ticker = yf.Ticker(yahoo_symbol)
-                data = ticker.history(start=start_date, end=end_date)
-                
-                if data.empty:
-                    print(f"No data for {original_symbol}")
-                    continue
-                
-                # Prepare DataFrame
-                df = data.reset_index()
-                df['symbol'] = original_symbol
-                df['date'] = df['Date'].dt.strftime('%Y-%m-%d')
-                
-                # Rename columns to match schema
-                df = df.rename(columns={
-                    'Open': 'open',
-                    'High': 'high',
-                    'Low': 'low',
-                    'Close': 'close',
-                    'Volume': 'volume'
-                })
-                
-                # Add sector information
-                df['sector'] = self.sector_mapper.get_sector(original_symbol)
-                
-                # Select required columns
-                df = df[['date', 'symbol', 'open', 'high', 'low', 'close', 'volume', 'sector']]
-                
-                # Filter trading days only
-                df = df[df['date'].apply(is_indian_trading_day)]
-                
-                all_data.append(df)
-                
-                if (i + 1) % 10 == 0:
-                    print(f"Loaded {i + 1}/{len(symbols)} stocks...")
-                    
-            except Exception as e:
-                print(f"Error loading {original_symbol}: {e}")
-                continue
+        loaded: Dict[str, Dict[str, np.ndarray]] = {}
+        for original_symbol, yahoo_symbol in zip(symbols, yahoo_symbols):
+            columns = self._history_columns(original_symbol, histories.get(yahoo_symbol))
+            if columns is not None:
+                loaded[original_symbol] = columns
+        
+        all_data = [loaded[symbol] for symbol in symbols if symbol in loaded]
         
         if not all_data:
             return pd.DataFrame()
         
-        # Combine all data
-        combined_df = pd.concat(all_data, ignore_index=True)
+        # Combine all data: one concatenate per column, one DataFrame
+        combined_df = pd.DataFrame({
+            name: np.concatenate([columns[name] for columns in all_data])
+            for name in YAHOO_COLUMNS
+        })
         
         # Validate data format
         IndianDataValidator.validate_data_format(combined_df)
         
-        print(f"Successfully loaded {len(combined_df)} records for {combined_df['symbol'].nunique()} stocks")
+        logger.info("Successfully loaded %d records for %d stocks",
+                    len(combined_df), combined_df['symbol'].nunique())
         return combined_df
     
+    def _history_columns(
+        self,
+        original_symbol: str,
+        data: Optional[pd.DataFrame]
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """Convert one symbol's Yahoo history to schema columns; None if unavailable."""
+        try:
+            if data is None or data.empty:
+                logger.warning("No data for %s", original_symbol)
+                return None
+            
+            # Read straight from the history frame's index and columns, keeping
+            # trading days only, instead of reshaping intermediate frames
+            dates = _session_dates(data.index)
+            keep = indian_trading_day_mask(dates.to_series()).to_numpy()
+            n = int(keep.sum())
+            
+            return {
+                'date': dates.to_numpy()[keep],
+                'symbol': np.full(n, original_symbol, dtype=object),
+                'open': data['Open'].to_numpy()[keep],
+                'high': data['High'].to_numpy()[keep],
+                'low': data['Low'].to_numpy()[keep],
+                'close': data['Close'].to_numpy()[keep],
+                'volume': data['Volume'].to_numpy()[keep],
+                'sector': np.full(n, self.sector_mapper.get_sector(original_symbol), dtype=object)
+            }
+            
+        except Exception as e:
+            logger.warning("Error loading %s: %s", original_symbol, e)
+            return None
+    
     def _load_from_csv(
         self,
         symbols: List[str],
@@ -137,17 +180,15 @@ class IndianDataLoader:
         all_data = []
         
         for symbol in symbols:
-            csv_path = f"data/indian_stocks/{symbol}.csv"
+            base_path = os.path.join(LOCAL_DATA_DIR, symbol)
             
-            if not os.path.exists(csv_path):
-                print(f"CSV file not found for {symbol}: {csv_path}")
+            if not (os.path.exists(f"{base_path}.parquet") or os.path.exists(f"{base_path}.csv")):
+                logger.warning("CSV file not found for %s: %s.csv", symbol, base_path)
                 continue
             
             try:
-                df = pd.read_csv(csv_path)
-                
-                # Standardize column names
-                df.columns = df.columns.str.lower()
+                # Only the date range and OHLCV columns are materialized
+                df = self._read_local_history(base_path, start_date, end_date)
                 
                 # Clean symbol
                 df['symbol'] = IndianDataValidator.clean_symbol(symbol)
@@ -155,16 +196,13 @@ class IndianDataLoader:
                 # Add sector
                 df['sector'] = self.sector_mapper.get_sector(symbol)
                 
-                # Filter date range
-                df = df[(df['date'] >= start_date) & (df['date'] <= end_date)]
-                
                 # Filter trading days
-                df = df[df['date'].apply(is_indian_trading_day)]
+                df = df[indian_trading_day_mask(df['date'])]
                 
                 all_data.append(df)
                 
             except Exception as e:
-                print(f"Error loading CSV for {symbol}: {e}")
+                logger.warning("Error loading CSV for %s: %s", symbol, e)
                 continue
         
         if not all_data:
@@ -183,38 +221,185 @@ class IndianDataLoader:
     ) -> pd.DataFrame:
         """Load Indian market index data for regime detection."""
         
-        from indian_market_config import INDIAN_INDICES
-        
         if index_name not in INDIAN_INDICES:
             raise ValueError(f"Unsupported index: {index_name}")
         
         yahoo_symbol = INDIAN_INDICES[index_name]
         
         try:
-            ticker = yf.Ticker(yahoo_symbol)
-            data = ticker.history(start=start_date, end=end_date)
+            data = self._load_cached_history(yahoo_symbol, start_date, end_date)
             
             if data.empty:
                 raise ValueError(f"No data available for {index_name}")
             
-            df = data.reset_index()
-            df['date'] = df['Date'].dt.strftime('%Y-%m-%d')
-            df['symbol'] = index_name
-            
-            df = df.rename(columns={
-                'Open': 'open',
-                'High': 'high',
-                'Low': 'low',
-                'Close': 'close',
-                'Volume': 'volume'
+            return pd.DataFrame({
+                'date': _session_dates(data.index),
+                'symbol': index_name,
+                'open': data['Open'].to_numpy(),
+                'high': data['High'].to_numpy(),
+                'low': data['Low'].to_numpy(),
+                'close': data['Close'].to_numpy(),
+                'volume': data['Volume'].to_numpy()
             })
             
-            return df[['date', 'symbol', 'open', 'high', 'low', 'close', 'volume']]
-            
         except Exception as e:
-            print(f"Error loading index {index_name}: {e}")
+            logger.warning("Error loading index %s: %s", index_name, e)
             return pd.DataFrame()
     
+    def _load_cached_history(
+        self,
+        yahoo_symbol: str,
+        start_date: Optional[str],
+        end_date: Optional[str]
+    ) -> pd.DataFrame:
+        """Return Yahoo history for a date range, served from disk when fresh."""
+        data = self._read_cache(yahoo_symbol, start_date, end_date)
+        if data is not None:
+            return data
+        
+        data = _get_ticker(yahoo_symbol).history(start=start_date, end=end_date)
+        self._write_cache(yahoo_symbol, start_date, end_date, data)
+        return data
+    
+    def _load_histories(
+        self,
+        yahoo_symbols: List[str],
+        start_date: str,
+        end_date: str
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Return Yahoo history per symbol, downloading all uncached symbols in
+        one batched yf.download call (column MultiIndex of ticker, field).
+        
+        Symbols that fail or come back empty are simply absent from the result.
+        """
+        histories: Dict[str, pd.DataFrame] = {}
+        for yahoo_symbol in yahoo_symbols:
+            data = self._read_cache(yahoo_symbol, start_date, end_date)
+            if data is not None:
+                histories[yahoo_symbol] = data
+        
+        missing = [s for s in yahoo_symbols if s not in histories]
+        if not missing:
+            return histories
+        
+        import yfinance as yf
+        
+        try:
+            data = yf.download(
+                missing, start=start_date, end=end_date, group_by='ticker',
+                auto_adjust=True, threads=YAHOO_MAX_WORKERS, progress=False
+            )
+        except Exception as e:
+            logger.warning("Batch download failed for %d symbols: %s", len(missing), e)
+            return histories
+        
+        for yahoo_symbol in missing:
+            if isinstance(data.columns, pd.MultiIndex):
+                if yahoo_symbol not in data.columns.get_level_values(0):
+                    continue
+                history = data[yahoo_symbol]
+            else:
+                history = data
+            # Batched frames share one date index; drop the other tickers' dates
+            history = history.dropna(how='all')
+            if not history.empty:
+                histories[yahoo_symbol] = history
+                self._write_cache(yahoo_symbol, start_date, end_date, history)
+        
+        return histories
+    
+    def _cache_path(
+        self,
+        yahoo_symbol: str,
+        start_date: Optional[str],
+        end_date: Optional[str]
+    ) -> str:
+        return os.path.join(self.cache_dir, f"{yahoo_symbol}_{start_date}_{end_date}.parquet")
+    
+    def _read_cache(
+        self,
+        yahoo_symbol: str,
+        start_date: Optional[str],
+        end_date: Optional[str]
+    ) -> Optional[pd.DataFrame]:
+        """Cached history if present and fresh, else None."""
+        if self.cache_dir is None:
+            return None
+        
+        cache_path = self._cache_path(yahoo_symbol, start_date, end_date)
+        
+        if os.path.exists(cache_path):
+            age = datetime.now() - datetime.fromtimestamp(os.path.getmtime(cache_path))
+            if age < YAHOO_CACHE_MAX_AGE:
+                try:
+                    return pd.read_parquet(cache_path)
+                except Exception as e:
+                    logger.debug("Ignoring unreadable cache file %s: %s", cache_path, e)
+        
+        return None
+    
+    def _write_cache(
+        self,
+        yahoo_symbol: str,
+        start_date: Optional[str],
+        end_date: Optional[str],
+        data: pd.DataFrame
+    ) -> None:
+        if self.cache_dir is None or data.empty:
+            return
+        
+        cache_path = self._cache_path(yahoo_symbol, start_date, end_date)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            data.to_parquet(cache_path, compression='zstd')
+        except Exception as e:
+            logger.debug("Could not write cache file %s: %s", cache_path, e)
+    
+    @staticmethod
+    def _read_local_history(base_path: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """
+        Read one symbol's local history restricted to [start_date, end_date].
+        
+        Parquet files are read with the date range pushed down as a row filter.
+        CSV files go through pyarrow's multithreaded parser reading only the
+        OHLCV columns, and are filtered before conversion to pandas.
+        """
+        start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+        
+        parquet_path = f"{base_path}.parquet"
+        if os.path.exists(parquet_path):
+            df = pd.read_parquet(
+                parquet_path,
+                columns=list(LOCAL_COLUMNS),
+                filters=[('date', '>=', start), ('date', '<=', end)]
+            )
+            df['date'] = pd.to_datetime(df['date'])
+            return df
+        
+        csv_path = f"{base_path}.csv"
+        # Column names may be capitalized; match them case-insensitively
+        header = pd.read_csv(csv_path, nrows=0).columns
+        names = [c for c in header if c.lower() in LOCAL_COLUMNS]
+        date_col = next(c for c in names if c.lower() == 'date')
+        
+        table = pa_csv.read_csv(
+            csv_path,
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=names,
+                column_types={date_col: pa.timestamp('ns')}
+            )
+        )
+        dates = table[date_col]
+        table = table.filter(pc.and_(
+            pc.greater_equal(dates, pa.scalar(start, type=pa.timestamp('ns'))),
+            pc.less_equal(dates, pa.scalar(end, type=pa.timestamp('ns')))
+        ))
+        
+        df = table.to_pandas()
+        df.columns = df.columns.str.lower()
+        return df
+    
     def get_nifty50_stocks(self) -> List[str]:
         """Get current NIFTY 50 stock list."""
         # Major NIFTY 50 stocks (update periodically)
@@ -245,33 +430,34 @@ class IndianDataLoader:
         )
         
         # Filter to trading days only
-        trading_dates = [d.strftime('%Y-%m-%d') for d in dates if is_indian_trading_day(d.strftime('%Y-%m-%d'))]
+        trading_dates = dates[indian_trading_day_mask(dates.to_series()).to_numpy()]
         
+        n = len(trading_dates)
+        rng = np.random.default_rng(42)
         all_data = []
         
         for symbol in symbols:
             base_price = {'RELIANCE': 2500, 'TCS': 3500, 'HDFCBANK': 1600}.get(symbol, 1000)
             
-            for date in trading_dates:
-                # Generate realistic Indian stock data
-                open_price = base_price * (0.98 + 0.04 * pd.np.random.random())
-                high_price = open_price * (1.0 + 0.03 * pd.np.random.random())
-                low_price = open_price * (1.0 - 0.03 * pd.np.random.random())
-                close_price = low_price + (high_price - low_price) * pd.np.random.random()
-                volume = int(1000000 * (0.5 + pd.np.random.random()))
-                
-                all_data.append({
-                    'date': date,
-                    'symbol': symbol,
-                    'open': round(open_price, 2),
-                    'high': round(high_price, 2),
-                    'low': round(low_price, 2),
-                    'close': round(close_price, 2),
-                    'volume': volume,
-                    'sector': self.sector_mapper.get_sector(symbol)
-                })
-        
-        return pd.DataFrame(all_data)
+            # Generate realistic Indian stock data, one vector per column
+            open_price = base_price * (0.98 + 0.04 * rng.random(n))
+            high_price = open_price * (1.0 + 0.03 * rng.random(n))
+            low_price = open_price * (1.0 - 0.03 * rng.random(n))
+            close_price = low_price + (high_price - low_price) * rng.random(n)
+            volume = (1000000 * (0.5 + rng.random(n))).astype(np.int64)
+            
+            all_data.append(pd.DataFrame({
+                'date': trading_dates,
+                'symbol': symbol,
+                'open': np.round(open_price, 2),
+                'high': np.round(high_price, 2),
+                'low': np.round(low_price, 2),
+                'close': np.round(close_price, 2),
+                'volume': volume,
+                'sector': self.sector_mapper.get_sector(symbol)
+            }))
+        
+        return pd.concat(all_data, ignore_index=True)
 
 # Convenience function for quick data loading
 def load_indian_stocks(
@@ -5,8 +5,11 @@ Adapts the trading system for Indian equity markets with proper
 trading hours, data formats, and market-specific considerations.
 """
 
+import functools
+import re
 from dataclasses import dataclass
 from typing import Dict, List
+import numpy as np
 import pandas as pd
 
 @dataclass
@@ -54,6 +57,12 @@ class IndianMarketConfig:
                 "2024-11-01",  # Diwali
                 # Add more as needed
             ]
+        # Calendar dates for O(1) lookups regardless of the caller's date format
+        self._holiday_set = frozenset(pd.to_datetime(self.market_holidays).date)
+
+# Symbol cleaning: trailing exchange suffix and punctuation removed by clean_symbol
+_EXCHANGE_SUFFIX_RE = re.compile(r'\.(NS|BO)$')
+_SYMBOL_STRIP = str.maketrans('', '', '-&')
 
 class IndianSectorMapper:
     """Maps Indian stocks to sectors using NSE classifications."""
@@ -97,12 +106,17 @@ class IndianSectorMapper:
         'SHREECEM': 'Cement', 'ACC': 'Cement'
     }
     
+    # Same mapping keyed by bare, .NS and .BO symbols so lookups need no cleaning
+    SECTOR_MAPPING_FULL = {
+        **SECTOR_MAPPING,
+        **{f"{symbol}.NS": sector for symbol, sector in SECTOR_MAPPING.items()},
+        **{f"{symbol}.BO": sector for symbol, sector in SECTOR_MAPPING.items()}
+    }
+    
     @classmethod
     def get_sector(cls, symbol: str) -> str:
-        """Get sector for Indian stock symbol."""
-        # Remove .NS or .BO suffix if present
-        clean_symbol = symbol.replace('.NS', '').replace('.BO', '')
-        return cls.SECTOR_MAPPING.get(clean_symbol, 'Others')
+        """Get sector for Indian stock symbol (with or without .NS/.BO suffix)."""
+        return cls.SECTOR_MAPPING_FULL.get(symbol, 'Others')
     
     @classmethod
     def get_sector_stocks(cls, sector: str) -> List[str]:
@@ -127,28 +141,31 @@ class IndianDataValidator:
         # Check for Indian stock symbols (should have .NS or .BO or be clean NSE symbols)
         sample_symbols = df['symbol'].head(10).tolist()
         
-        # Validate date format
-        try:
-            pd.to_datetime(df['date'].head())
-        except:
-            raise ValueError("Invalid date format. Expected YYYY-MM-DD")
+        # Validate date format (loaders already deliver datetime64 columns)
+        if not pd.api.types.is_datetime64_any_dtype(df['date']):
+            try:
+                pd.to_datetime(df['date'].iloc[:5])
+            except:
+                raise ValueError("Invalid date format. Expected YYYY-MM-DD")
         
         # Check for reasonable price ranges (INR)
-        if df['close'].min() < 0 or df['close'].max() > 100000:
+        low, high = df['close'].agg(['min', 'max'])
+        if low < 0 or high > 100000:
             raise ValueError("Unreasonable price range detected")
         
         return True
     
     @staticmethod
+    @functools.lru_cache(maxsize=4096)
     def clean_symbol(symbol: str) -> str:
         """Clean Indian stock symbol for consistency."""
-        # Remove exchange suffixes and standardize
-        symbol = symbol.replace('.NS', '').replace('.BO', '')
-        symbol = symbol.replace('-', '').replace('&', '')
-        return symbol.upper()
+        # Remove exchange suffix, drop '-'/'&' and standardize in one pass each
+        return _EXCHANGE_SUFFIX_RE.sub('', symbol).translate(_SYMBOL_STRIP).upper()
 
 # Indian market specific constants
 INDIAN_MARKET_CONFIG = IndianMarketConfig()
+HOLIDAYS_SET = INDIAN_MARKET_CONFIG._holiday_set
+HOLIDAYS_ARRAY = np.array(sorted(HOLIDAYS_SET), dtype='datetime64[D]')
 
 # Major Indian indices for market regime detection
 INDIAN_INDICES = {
@@ -162,8 +179,6 @@ INDIAN_INDICES = {
 # Indian market trading calendar helpers
 def is_indian_trading_day(date_str: str) -> bool:
     """Check if given date is a trading day in Indian markets."""
-    import datetime
-    
     date_obj = pd.to_datetime(date_str).date()
     
     # Check if weekend
@@ -171,11 +186,17 @@ def is_indian_trading_day(date_str: str) -> bool:
         return False
     
     # Check if holiday
-    if date_str in INDIAN_MARKET_CONFIG.market_holidays:
+    if date_obj in HOLIDAYS_SET:
         return False
     
     return True
 
+def indian_trading_day_mask(dates: pd.Series) -> pd.Series:
+    """Vectorized is_indian_trading_day for a column of dates."""
+    dt = pd.to_datetime(dates)
+    is_holiday = np.isin(dt.to_numpy().astype('datetime64[D]'), HOLIDAYS_ARRAY)
+    return (dt.dt.weekday < 5) & ~is_holiday
+
 def get_indian_market_hours() -> Dict[str, str]:
     """Get Indian market trading hours."""
     return {
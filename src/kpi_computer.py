@@ -5,10 +5,51 @@ The system computes essential metrics that guide trading decisions and system
 optimization without requiring charts or visual analysis.
 """
 
-from typing import Dict, List, Optional
+import functools
+from typing import Dict, List, Optional, Union
 import pandas as pd
 import numpy as np
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the NumPy path is used without it
+    njit = None
+
+# Equity curves longer than this go through the JIT kernel when numba is available
+NUMBA_MIN_POINTS = 10_000
+
+
+def _max_drawdown_loop(values: np.ndarray) -> float:
+    """Single-pass peak tracking and drawdown (fraction) without temporaries"""
+    peak = values[0]
+    max_dd = 0.0
+    for v in values:
+        if v > peak:
+            peak = v
+        else:
+            dd = (peak - v) / peak
+            if dd > max_dd:
+                max_dd = dd
+    return max_dd
+
+
+_max_drawdown_nb = njit(cache=True, fastmath=True)(_max_drawdown_loop) if njit else None
+
+
+@functools.lru_cache(maxsize=64)
+def _bucket_midpoint(bucket_name: str) -> Optional[float]:
+    """Extract expected win rate from bucket name (memoized per name)."""
+    if '-' in bucket_name:
+        try:
+            parts = bucket_name.split('-')
+            if len(parts) == 2:
+                low = float(parts[0])
+                high = float(parts[1])
+                return (low + high) / 2
+        except ValueError:
+            pass
+    return None
+
 
 class KPIComputer:
     """
@@ -22,7 +63,7 @@ class KPIComputer:
     @staticmethod
     def compute_kpis(
         trades: List,
-        equity_curve: List[Dict],
+        equity_curve: Union[List[Dict], pd.DataFrame, np.ndarray],
         confidence_buckets: Optional[List[Dict]] = None,
         signal_data: Optional[List[Dict]] = None
     ) -> Dict:
@@ -30,13 +71,21 @@ class KPIComputer:
         Compute comprehensive KPI report.
         
         Args:
-            trades: List of Trade objects with pnl, pnl_pct attributes
-            equity_curve: List of equity curve points with total_value
+            trades: List of Trade objects with pnl, pnl_pct attributes, a
+                columnar TradeArrays with the same fields as arrays, or a
+                float array of trade PnLs
+            equity_curve: List of equity curve points with total_value, a
+                DataFrame with a total_value column, or an array of the values
             confidence_buckets: Optional list with confidence_bucket, outcome fields
+            signal_data: Optional list of signals with symbol, date, executed
+                fields; needs trades with symbol/entry_date (not a PnL array)
             
         Returns:
             Dict with all KPI metrics and analysis
             
+        Raises:
+            ValueError: If signal_data is given with a bare PnL array
+            
         Example:
             kpis = KPIComputer.compute_kpis(
                 trades=backtest_results['trades'],
@@ -44,13 +93,20 @@ class KPIComputer:
                 confidence_buckets=confidence_data
             )
         """
-        if not trades:
+        if trades is None or len(trades) == 0:
             return KPIComputer._empty_kpis()
+        if signal_data and isinstance(trades, np.ndarray):
+            raise ValueError("signal_data needs trades with symbol and entry_date, not a PnL array")
+        
+        # Walk the trade objects once; every PnL-based metric reuses this array
+        # and the winning-trade mask
+        pnls = KPIComputer._pnl_array(trades)
+        wins = pnls > 0
         
         # Core metrics
-        expectancy = KPIComputer._calculate_expectancy(trades)
+        expectancy = KPIComputer._calculate_expectancy(pnls)
         max_drawdown = KPIComputer._calculate_max_drawdown(equity_curve)
-        win_rate = KPIComputer._calculate_win_rate(trades)
+        win_rate = KPIComputer._calculate_win_rate(pnls, wins)
         
         # Confidence bucket analysis
         bucket_stats = {}
@@ -63,7 +119,7 @@ class KPIComputer:
             signal_quality = KPIComputer._analyze_signal_quality(signal_data, trades)
         
         # Additional metrics
-        trade_stats = KPIComputer._calculate_trade_stats(trades)
+        trade_stats = KPIComputer._calculate_trade_stats(pnls, wins)
         
         return {
             'expectancy': expectancy,
@@ -77,42 +133,86 @@ class KPIComputer:
         }
     
     @staticmethod
-    def _calculate_expectancy(trades: List) -> float:
+    def compute_kpis_from_arrays(pnls: np.ndarray, equity_values: np.ndarray) -> Dict:
+        """
+        KPI report from a PnL array and an equity value array.
+        
+        For simulations that never build trade objects or curve points; the
+        result matches compute_kpis on the equivalent trades and curve.
+        """
+        return KPIComputer.compute_kpis(
+            np.asarray(pnls, dtype=float), np.asarray(equity_values, dtype=float)
+        )
+    
+    @staticmethod
+    def _pnl_array(trades) -> np.ndarray:
+        """PnL of each trade as a float array (arrays are passed through)."""
+        if isinstance(trades, np.ndarray):
+            return trades
+        if isinstance(getattr(trades, 'pnl', None), np.ndarray):  # TradeArrays
+            return trades.pnl
+        return np.fromiter((trade.pnl for trade in trades), dtype=float, count=len(trades))
+    
+    @staticmethod
+    def _trade_pnl_index(trades) -> Dict:
+        """Map (symbol, entry_date) to the PnL of the first matching trade."""
+        if isinstance(getattr(trades, 'pnl', None), np.ndarray):  # TradeArrays
+            keys = zip(trades.symbol, trades.entry_date, trades.pnl.tolist())
+        else:
+            keys = ((t.symbol, t.entry_date, t.pnl) for t in trades)
+        
+        index = {}
+        for symbol, entry_date, pnl in keys:
+            index.setdefault((symbol, entry_date), pnl)
+        return index
+    
+    @staticmethod
+    def _calculate_expectancy(trades) -> float:
         """Calculate expectancy (average profit per trade)."""
-        if not trades:
+        pnls = KPIComputer._pnl_array(trades)
+        if len(pnls) == 0:
             return 0.0
         
-        total_pnl = sum(trade.pnl for trade in trades)
-        return round(total_pnl / len(trades), 2)
+        return round(float(pnls.sum()) / len(pnls), 2)
     
     @staticmethod
-    def _calculate_max_drawdown(equity_curve: List[Dict]) -> float:
+    def _calculate_max_drawdown(equity_curve: Union[List[Dict], pd.DataFrame, np.ndarray]) -> float:
         """Calculate maximum drawdown percentage."""
         if len(equity_curve) < 2:
             return 0.0
         
-        values = [point['total_value'] for point in equity_curve]
-        peak = values[0]
-        max_dd = 0.0
+        if isinstance(equity_curve, np.ndarray):
+            values = equity_curve.astype(float, copy=False)
+        elif isinstance(equity_curve, pd.DataFrame):
+            values = equity_curve['total_value'].to_numpy(dtype=float)
+        else:
+            values = np.fromiter(
+                (point['total_value'] for point in equity_curve),
+                dtype=float,
+                count=len(equity_curve)
+            )
         
-        for value in values:
-            if value > peak:
-                peak = value
-            
-            drawdown = (peak - value) / peak
-            if drawdown > max_dd:
-                max_dd = drawdown
+        if _max_drawdown_nb is not None and len(values) > NUMBA_MIN_POINTS:
+            # Fused native loop avoids the running-peak temporary on long curves
+            max_dd = float(_max_drawdown_nb(values))
+        else:
+            # Running peak and drawdown from it in one vectorized pass
+            peaks = np.maximum.accumulate(values)
+            max_dd = float(((peaks - values) / peaks).max())
         
         return round(max_dd * 100, 2)
     
     @staticmethod
-    def _calculate_win_rate(trades: List) -> float:
-        """Calculate win rate percentage."""
-        if not trades:
+    def _calculate_win_rate(trades, wins: Optional[np.ndarray] = None) -> float:
+        """Calculate win rate percentage (`wins` is an optional precomputed pnl > 0 mask)."""
+        pnls = KPIComputer._pnl_array(trades)
+        if len(pnls) == 0:
             return 0.0
         
-        winning_trades = sum(1 for trade in trades if trade.pnl > 0)
-        return round((winning_trades / len(trades)) * 100, 1)
+        if wins is None:
+            wins = pnls > 0
+        winning_trades = int(np.count_nonzero(wins))
+        return round((winning_trades / len(pnls)) * 100, 1)
     
     @staticmethod
     def _analyze_confidence_buckets(confidence_data: List[Dict]) -> Dict:
@@ -139,7 +239,8 @@ class KPIComputer:
             actual_win_rate = (data['wins'] / data['total']) * 100 if data['total'] > 0 else 0
             
             # Extract expected win rate from bucket name (e.g., "70-75" -> 72.5)
-            expected_rate = KPIComputer._extract_expected_rate(bucket)
+            # (normalized to 0.0 for unparseable names so consumers need no None check)
+            expected_rate = KPIComputer._extract_expected_rate(bucket) or 0.0
             
             calibration_error = abs(actual_win_rate - expected_rate) if expected_rate else 0
             
@@ -160,27 +261,21 @@ class KPIComputer:
             return {}
         
         total_signals = len(signal_data)
-        executed_signals = len([s for s in signal_data if s.get('executed', False)])
+        executed = [s for s in signal_data if s.get('executed', False)]
+        executed_signals = len(executed)
         
         # Calculate conversion rate
         conversion_rate = (executed_signals / total_signals * 100) if total_signals > 0 else 0
         
-        # Analyze signal accuracy (for executed signals that became trades)
-        profitable_signals = 0
-        executed_count = 0
+        # Analyze signal accuracy (for executed signals that became trades);
+        # trades are looked up in an O(1) index rather than scanned per signal
+        trade_pnl = KPIComputer._trade_pnl_index(trades)
+        profitable_signals = sum(
+            1 for signal in executed
+            if trade_pnl.get((signal.get('symbol'), signal.get('date')), 0) > 0
+        )
         
-        for signal in signal_data:
-            if signal.get('executed', False):
-                executed_count += 1
-                # Find corresponding trade
-                matching_trade = next(
-                    (t for t in trades if t.symbol == signal.get('symbol') and 
-                     t.entry_date == signal.get('date')), None
-                )
-                if matching_trade and matching_trade.pnl > 0:
-                    profitable_signals += 1
-        
-        signal_accuracy = (profitable_signals / executed_count * 100) if executed_count > 0 else 0
+        signal_accuracy = (profitable_signals / executed_signals * 100) if executed_signals > 0 else 0
         
         # Analyze rejection reasons
         rejection_reasons = {}
@@ -198,41 +293,32 @@ class KPIComputer:
             'rejection_reasons': rejection_reasons
         }
     
-    @staticmethod
-    def _extract_expected_rate(bucket_name: str) -> Optional[float]:
-        """Extract expected win rate from bucket name."""
-        if '-' in bucket_name:
-            try:
-                parts = bucket_name.split('-')
-                if len(parts) == 2:
-                    low = float(parts[0])
-                    high = float(parts[1])
-                    return (low + high) / 2
-            except ValueError:
-                pass
-        return None
+    # Bucket names are a small fixed set, so parsing is cached module-wide
+    _extract_expected_rate = staticmethod(_bucket_midpoint)
     
     @staticmethod
-    def _calculate_trade_stats(trades: List) -> Dict:
-        """Calculate detailed trade statistics."""
-        if not trades:
+    def _calculate_trade_stats(trades, wins: Optional[np.ndarray] = None) -> Dict:
+        """Calculate detailed trade statistics (`wins` as in _calculate_win_rate)."""
+        pnls = KPIComputer._pnl_array(trades)
+        if len(pnls) == 0:
             return {}
         
-        pnls = [trade.pnl for trade in trades]
-        winning_trades = [trade.pnl for trade in trades if trade.pnl > 0]
-        losing_trades = [trade.pnl for trade in trades if trade.pnl < 0]
+        if wins is None:
+            wins = pnls > 0
+        winning_trades = pnls[wins]
+        losing_trades = pnls[pnls < 0]
         
         stats = {
-            'avg_win': round(np.mean(winning_trades), 2) if winning_trades else 0.0,
-            'avg_loss': round(np.mean(losing_trades), 2) if losing_trades else 0.0,
-            'largest_win': round(max(pnls), 2),
-            'largest_loss': round(min(pnls), 2),
+            'avg_win': round(float(winning_trades.mean()), 2) if len(winning_trades) else 0.0,
+            'avg_loss': round(float(losing_trades.mean()), 2) if len(losing_trades) else 0.0,
+            'largest_win': round(float(pnls.max()), 2),
+            'largest_loss': round(float(pnls.min()), 2),
             'profit_factor': 0.0
         }
         
         # Profit factor = Gross Profit / Gross Loss
-        gross_profit = sum(winning_trades) if winning_trades else 0
-        gross_loss = abs(sum(losing_trades)) if losing_trades else 0
+        gross_profit = float(winning_trades.sum())
+        gross_loss = abs(float(losing_trades.sum()))
         
         if gross_loss > 0:
             stats['profit_factor'] = round(gross_profit / gross_loss, 2)
@@ -284,57 +370,62 @@ class KPIComputer:
         if kpis['total_trades'] == 0:
             return "=== KPI REPORT ===\nNo trades to analyze"
         
-        report = ["=== KPI REPORT ===\n"]
-        
-        # Core Metrics
-        report.append("CORE METRICS:")
-        report.append(f"  Expectancy: ${kpis['expectancy']:.2f} per trade")
-        report.append(f"  Max Drawdown: {kpis['max_drawdown_pct']:.1f}%")
-        report.append(f"  Win Rate: {kpis['win_rate_pct']:.1f}%")
-        report.append(f"  Total Trades: {kpis['total_trades']}")
-        report.append("")
+        report = [
+            "=== KPI REPORT ===\n",
+            f"CORE METRICS:\n"
+            f"  Expectancy: ${kpis['expectancy']:.2f} per trade\n"
+            f"  Max Drawdown: {kpis['max_drawdown_pct']:.1f}%\n"
+            f"  Win Rate: {kpis['win_rate_pct']:.1f}%\n"
+            f"  Total Trades: {kpis['total_trades']}\n"
+        ]
         
         # Trade Statistics
         if kpis['trade_statistics']:
             stats = kpis['trade_statistics']
-            report.append("TRADE STATISTICS:")
-            report.append(f"  Average Win: ${stats['avg_win']:.2f}")
-            report.append(f"  Average Loss: ${stats['avg_loss']:.2f}")
-            report.append(f"  Largest Win: ${stats['largest_win']:.2f}")
-            report.append(f"  Largest Loss: ${stats['largest_loss']:.2f}")
-            report.append(f"  Profit Factor: {stats['profit_factor']:.2f}")
-            report.append("")
+            report.append(
+                f"TRADE STATISTICS:\n"
+                f"  Average Win: ${stats['avg_win']:.2f}\n"
+                f"  Average Loss: ${stats['avg_loss']:.2f}\n"
+                f"  Largest Win: ${stats['largest_win']:.2f}\n"
+                f"  Largest Loss: ${stats['largest_loss']:.2f}\n"
+                f"  Profit Factor: {stats['profit_factor']:.2f}\n"
+            )
         
         # Signal Quality Analysis
         if kpis['signal_quality_stats']:
             sq = kpis['signal_quality_stats']
-            report.append("SIGNAL QUALITY:")
-            report.append(f"  Total Signals: {sq['total_signals']}")
-            report.append(f"  Executed: {sq['executed_signals']} ({sq['conversion_rate_pct']:.1f}%)")
-            report.append(f"  Signal Accuracy: {sq['signal_accuracy_pct']:.1f}%")
+            report.append(
+                f"SIGNAL QUALITY:\n"
+                f"  Total Signals: {sq['total_signals']}\n"
+                f"  Executed: {sq['executed_signals']} ({sq['conversion_rate_pct']:.1f}%)\n"
+                f"  Signal Accuracy: {sq['signal_accuracy_pct']:.1f}%"
+            )
             
             if sq['rejection_reasons']:
+                total = sq['total_signals']
                 report.append("  Rejection Reasons:")
-                for reason, count in sq['rejection_reasons'].items():
-                    pct = (count / sq['total_signals'] * 100) if sq['total_signals'] > 0 else 0
-                    report.append(f"    {reason}: {count} ({pct:.1f}%)")
+                report.append("\n".join(
+                    f"    {reason}: {count} ({(count / total * 100) if total > 0 else 0:.1f}%)"
+                    for reason, count in sq['rejection_reasons'].items()
+                ))
             report.append("")
         
         # Confidence Bucket Analysis
         if kpis['confidence_bucket_stats']:
-            report.append("CONFIDENCE CALIBRATION:")
-            report.append("  Bucket    | Trades | Actual | Expected | Error")
-            report.append("  ----------|--------|--------|----------|------")
-            
-            for bucket, stats in kpis['confidence_bucket_stats'].items():
-                expected = stats['expected_win_rate'] or 0
-                report.append(f"  {bucket:<9} | {stats['trades']:>6} | "
-                            f"{stats['actual_win_rate']:>5.1f}% | {expected:>7.1f}% | "
-                            f"{stats['calibration_error']:>4.1f}%")
+            report.append(
+                "CONFIDENCE CALIBRATION:\n"
+                "  Bucket    | Trades | Actual | Expected | Error\n"
+                "  ----------|--------|--------|----------|------"
+            )
+            report.append("\n".join(
+                f"  {bucket:<9} | {stats['trades']:>6} | "
+                f"{stats['actual_win_rate']:>5.1f}% | {stats['expected_win_rate']:>7.1f}% | "
+                f"{stats['calibration_error']:>4.1f}%"
+                for bucket, stats in kpis['confidence_bucket_stats'].items()
+            ))
             report.append("")
         
         # Summary
-        report.append("SUMMARY:")
-        report.append(f"  {kpis['summary']}")
+        report.append(f"SUMMARY:\n  {kpis['summary']}")
         
         return "\n".join(report)
\ No newline at end of file
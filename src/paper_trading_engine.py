@@ -7,8 +7,14 @@ Key difference from backtest: uses current market data, no historical simulation
 
 from typing import Dict, List, Optional
 from datetime import datetime
+import numpy as np
 import pandas as pd
 
+from ._numba_kernels import score_universe, stack_tails
+
+# Bars of history the entry scores look at
+SCORE_WINDOW = 20
+
 
 class PaperTradingEngine:
     """
@@ -24,10 +30,14 @@ class PaperTradingEngine:
     def __init__(self):
         self.paper_positions: Dict = {}
         self.paper_cash = 100000.0
+        self._md: Optional[pd.DataFrame] = None
+        self._slices: Dict[str, slice] = {}
+        self._arrays: Dict[str, tuple] = {}
+        self._market_regime = "NEUTRAL"
     
     def generate_daily_signals(
         self,
-        market_data: pd.DataFrame,
+        market_data: Optional[pd.DataFrame],
         date: str,
         universe: List[str]
     ) -> Dict:
@@ -35,13 +45,17 @@ class PaperTradingEngine:
         Generate trading signals for current trading day.
         
         Args:
-            market_data: Current market data with OHLCV + indicators
+            market_data: Current market data with OHLCV + indicators, or None
+                to reuse the frame last passed to prepare()
             date: Current trading date
             universe: List of symbols to analyze
             
         Returns:
             Daily signal report with recommendations
         """
+        if market_data is not None:
+            self.prepare(market_data)
+        
         signals = {
             'date': date,
             'timestamp': datetime.now().isoformat(),
@@ -49,16 +63,30 @@ class PaperTradingEngine:
             'exit_signals': [],
             'no_action': [],
             'portfolio_status': self._get_portfolio_status(),
-            'market_regime': self._assess_market_regime(market_data)
+            'market_regime': self._market_regime
         }
         
-        # Generate entry signals for universe
-        for symbol in universe:
-            symbol_data = market_data[market_data['symbol'] == symbol]
-            if symbol_data.empty or symbol in self.paper_positions:
-                continue
-            
-            entry_signal = self._generate_entry_signal(symbol_data, date)
+        # Generate entry signals for universe: score all candidates in one batch
+        candidates = [
+            symbol for symbol in universe
+            if symbol in self._arrays and symbol not in self.paper_positions
+        ]
+        close2d, lengths = stack_tails(
+            [self._arrays[symbol][0] for symbol in candidates], SCORE_WINDOW
+        )
+        vol2d, _ = stack_tails(
+            [self._arrays[symbol][1] for symbol in candidates], SCORE_WINDOW
+        )
+        accumulation_scores, trigger_scores = score_universe(close2d, vol2d, lengths)
+        
+        for i, symbol in enumerate(candidates):
+            entry_signal = self._entry_signal_from_scores(
+                symbol,
+                self._arrays[symbol][0][-1],
+                float(accumulation_scores[i]),
+                float(trigger_scores[i]),
+                self._calculate_sector_score(self._symbol_frame(symbol))
+            )
             if entry_signal:
                 signals['entry_signals'].append(entry_signal)
             else:
@@ -67,31 +95,85 @@ class PaperTradingEngine:
                     'reason': 'No qualifying entry signal'
                 })
         
-        # Generate exit signals for existing positions
-        for symbol in list(self.paper_positions.keys()):
-            symbol_data = market_data[market_data['symbol'] == symbol]
-            if symbol_data.empty:
-                continue
-            
-            exit_signal = self._generate_exit_signal(symbol_data, date, symbol)
-            if exit_signal:
-                signals['exit_signals'].append(exit_signal)
+        # Generate exit signals for existing positions: latest prices and stops
+        # as parallel arrays, so every stop is checked in one comparison
+        held = [symbol for symbol in self.paper_positions if symbol in self._arrays]
+        current_prices = np.array([self._arrays[symbol][0][-1] for symbol in held], dtype=float)
+        stop_prices = np.array(
+            [self.paper_positions[symbol]['stop_price'] for symbol in held], dtype=float
+        )
+        for i in np.flatnonzero(current_prices <= stop_prices):
+            signals['exit_signals'].append(self._stop_loss_signal(held[i], current_prices[i]))
         
         return signals
     
+    def prepare(self, market_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Index market data by (symbol, date) and keep it for signal generation.
+        
+        The sorted index makes each symbol's rows one contiguous slice in date
+        order (so iloc[-1]/tail(N) are the latest bars); the slice and its
+        close/volume array views are cached per symbol for the scoring helpers. Callers that generate
+        signals repeatedly on the same data can prepare once and pass None.
+        """
+        keys = ['symbol', 'date'] if 'date' in market_data.columns else ['symbol']
+        md = market_data.set_index(keys).sort_index(kind='stable')
+        if isinstance(md.index, pd.MultiIndex):
+            md.index = md.index.remove_unused_levels()
+            symbols = md.index.levels[0]
+        else:
+            symbols = md.index.unique()
+        
+        close = md['close'].to_numpy(dtype=float)
+        volume = md['volume'].to_numpy(dtype=float)
+        slices, arrays = {}, {}
+        for symbol in symbols:
+            loc = md.index.get_loc(symbol)
+            if not isinstance(loc, slice):
+                loc = slice(loc, loc + 1)
+            slices[symbol] = loc
+            arrays[symbol] = (close[loc], volume[loc])
+        
+        self._md = md
+        self._slices = slices
+        self._arrays = arrays
+        # SPY comes out of the same scan, so the regime is settled here too
+        self._market_regime = self._regime_from_close(
+            arrays['SPY'][0] if 'SPY' in arrays else close[:0]
+        )
+        return md
+    
+    def _symbol_frame(self, symbol: str) -> pd.DataFrame:
+        """Date-ordered rows for one symbol from the prepared frame."""
+        return self._md.iloc[self._slices[symbol]]
+    
     def _generate_entry_signal(self, symbol_data: pd.DataFrame, date: str) -> Optional[Dict]:
         """Generate entry signal for a symbol."""
         if symbol_data.empty:
             return None
         
-        symbol = symbol_data.iloc[0]['symbol']
-        current_price = symbol_data.iloc[-1]['close']
+        # Raw column views once; the scoring helpers work on plain arrays
+        close = symbol_data['close'].to_numpy()
+        volume = symbol_data['volume'].to_numpy()
         
         # Simplified agent scoring (would use actual agents in production)
-        accumulation_score = self._calculate_accumulation_score(symbol_data)
-        trigger_score = self._calculate_trigger_score(symbol_data)
-        sector_score = self._calculate_sector_score(symbol_data)
-        
+        return self._entry_signal_from_scores(
+            symbol_data['symbol'].iat[0],
+            close[-1],
+            self._calculate_accumulation_score(volume),
+            self._calculate_trigger_score(close),
+            self._calculate_sector_score(symbol_data)
+        )
+    
+    def _entry_signal_from_scores(
+        self,
+        symbol: str,
+        current_price: float,
+        accumulation_score: float,
+        trigger_score: float,
+        sector_score: float
+    ) -> Optional[Dict]:
+        """Turn agent scores into a BUY signal if confidence clears the threshold."""
         # Calculate confidence
         confidence = (accumulation_score + trigger_score + sector_score) / 3
         
@@ -122,43 +204,47 @@ class PaperTradingEngine:
         if symbol not in self.paper_positions:
             return None
         
-        position = self.paper_positions[symbol]
         current_price = symbol_data.iloc[-1]['close']
         
         # Check stop loss
-        if current_price <= position['stop_price']:
-            pnl_pct = ((current_price - position['entry_price']) / position['entry_price']) * 100
-            
-            return {
-                'symbol': symbol,
-                'action': 'SELL',
-                'price': current_price,
-                'shares': position['shares'],
-                'reason': 'STOP_LOSS',
-                'pnl_pct': pnl_pct,
-                'rationale': f"Stop loss triggered at ${current_price:.2f}"
-            }
+        if current_price <= self.paper_positions[symbol]['stop_price']:
+            return self._stop_loss_signal(symbol, current_price)
         
         return None
     
-    def _calculate_accumulation_score(self, data: pd.DataFrame) -> float:
-        """Simplified accumulation scoring."""
-        if len(data) < 20:
+    def _stop_loss_signal(self, symbol: str, current_price: float) -> Dict:
+        """SELL signal for a held position whose stop was hit."""
+        position = self.paper_positions[symbol]
+        pnl_pct = ((current_price - position['entry_price']) / position['entry_price']) * 100
+        
+        return {
+            'symbol': symbol,
+            'action': 'SELL',
+            'price': current_price,
+            'shares': position['shares'],
+            'reason': 'STOP_LOSS',
+            'pnl_pct': pnl_pct,
+            'rationale': f"Stop loss triggered at ${current_price:.2f}"
+        }
+    
+    def _calculate_accumulation_score(self, volume: np.ndarray) -> float:
+        """Simplified accumulation scoring from a volume array."""
+        if len(volume) < 20:
             return 50.0
         
-        recent_volume = data['volume'].tail(5).mean()
-        avg_volume = data['volume'].tail(20).mean()
+        recent_volume = volume[-5:].mean()
+        avg_volume = volume[-20:].mean()
         volume_ratio = recent_volume / avg_volume if avg_volume > 0 else 1.0
         
         return min(volume_ratio * 30 + 40, 100.0)
     
-    def _calculate_trigger_score(self, data: pd.DataFrame) -> float:
-        """Simplified trigger scoring."""
-        if len(data) < 20:
+    def _calculate_trigger_score(self, close: np.ndarray) -> float:
+        """Simplified trigger scoring from a close price array."""
+        if len(close) < 20:
             return 50.0
         
-        current_price = data['close'].iloc[-1]
-        sma_20 = data['close'].tail(20).mean()
+        current_price = close[-1]
+        sma_20 = close[-20:].mean()
         
         if current_price > sma_20 * 1.02:  # 2% above SMA
             return 85.0
@@ -171,14 +257,21 @@ class PaperTradingEngine:
         """Simplified sector scoring."""
         return 70.0  # Neutral sector score
     
-    def _assess_market_regime(self, market_data: pd.DataFrame) -> str:
-        """Assess current market regime."""
-        spy_data = market_data[market_data['symbol'] == 'SPY']
-        if spy_data.empty or len(spy_data) < 20:
+    def _assess_market_regime(self, market_data: Optional[pd.DataFrame] = None) -> str:
+        """Assess current market regime (as of the last prepare() if no data is given)."""
+        if market_data is None:
+            return self._market_regime
+        spy_close = market_data.loc[market_data['symbol'] == 'SPY', 'close'].to_numpy(dtype=float)
+        return self._regime_from_close(spy_close)
+    
+    @staticmethod
+    def _regime_from_close(spy_close: np.ndarray) -> str:
+        """Classify the regime from SPY closes against their 20-day SMA."""
+        if len(spy_close) < 20:
             return "NEUTRAL"
         
-        current_price = spy_data['close'].iloc[-1]
-        sma_20 = spy_data['close'].tail(20).mean()
+        current_price = spy_close[-1]
+        sma_20 = spy_close[-20:].mean()
         
         if current_price > sma_20 * 1.02:
             return "RISK_ON"
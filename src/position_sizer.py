@@ -6,6 +6,7 @@ volatility and signal confidence levels.
 """
 
 from typing import Dict, Tuple
+import numpy as np
 import pandas as pd
 
 
@@ -34,6 +35,13 @@ class PositionSizer:
         85: 1.00,   # 100% participation for 85%+ confidence
     }
     
+    # Participation rate for every whole confidence point 0..100; bucket edges
+    # are whole numbers, so flooring a score never crosses into another bucket
+    _PART_TABLE = np.zeros(101)
+    for _edge, _rate in sorted(CONFIDENCE_PARTICIPATION.items()):
+        _PART_TABLE[_edge:] = _rate
+    del _edge, _rate
+    
     @staticmethod
     def position_size(
         account_value: float,
@@ -110,13 +118,9 @@ class PositionSizer:
     @staticmethod
     def _get_participation_rate(confidence_score: float) -> float:
         """Map confidence score to participation rate."""
-        # Find the appropriate confidence bucket
-        for min_conf in sorted(PositionSizer.CONFIDENCE_PARTICIPATION.keys(), reverse=True):
-            if confidence_score >= min_conf:
-                return PositionSizer.CONFIDENCE_PARTICIPATION[min_conf]
-        
-        # Below minimum threshold
-        return 0.0
+        if not confidence_score >= 0:
+            return 0.0  # Negative or missing score
+        return float(PositionSizer._PART_TABLE[int(min(confidence_score, 100))])
     
     @staticmethod
     def _get_volatility_adjustment(daily_volatility: float) -> float:
@@ -144,21 +148,57 @@ class PositionSizer:
             
         Returns:
             DataFrame with added position sizing columns
+            
+        Raises:
+            ValueError: If a row above the confidence threshold has a zero,
+                negative or missing ATR
         """
-        results = []
+        entry_price = df['entry_price'].to_numpy(dtype=float)
+        atr = df['atr'].to_numpy(dtype=float)
+        confidence = df['confidence_score'].to_numpy(dtype=float)
+        if 'daily_volatility' in df.columns:
+            daily_vol = df['daily_volatility'].to_numpy(dtype=float)
+        else:
+            daily_vol = np.full(len(df), np.nan)
         
-        for _, row in df.iterrows():
-            daily_vol = row.get('daily_volatility', None)
-            
-            size_info = PositionSizer.position_size(
-                account_value=account_value,
-                entry_price=row['entry_price'],
-                atr=row['atr'],
-                confidence_score=row['confidence_score'],
-                daily_volatility=daily_vol
+        # Same steps as position_size, one array operation per step
+        tradeable = confidence >= PositionSizer.MIN_CONFIDENCE_THRESHOLD
+        
+        base_risk = account_value * PositionSizer.BASE_RISK_PER_TRADE
+        points = np.clip(np.nan_to_num(confidence, nan=0.0), 0, 100).astype(np.int64)
+        participation_rate = PositionSizer._PART_TABLE[points]
+        adjusted_risk = base_risk * participation_rate
+        
+        stop_distance = atr * PositionSizer.ATR_STOP_MULTIPLIER
+        stop_price = entry_price - stop_distance
+        
+        # Missing volatility means no adjustment, as when position_size gets None
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volatility_adjustment = np.where(
+                np.isnan(daily_vol) | (daily_vol <= PositionSizer.MAX_VOLATILITY_THRESHOLD),
+                1.0,
+                np.maximum(PositionSizer.MAX_VOLATILITY_THRESHOLD / daily_vol, 0.25)
+            )
+            final_position_size = adjusted_risk / stop_distance * volatility_adjustment
+        
+        # position_size raises on these rows; don't let them cast to garbage share counts
+        invalid = tradeable & ~((stop_distance > 0) & np.isfinite(final_position_size))
+        if invalid.any():
+            raise ValueError(f"Invalid ATR for rows: {df.index[invalid].tolist()}")
+        
+        result_df = pd.DataFrame({
+            'position_size': np.where(tradeable, final_position_size, 0).astype(np.int64),
+            'stop_price': np.where(tradeable, np.round(stop_price, 2), 0.0),
+            'risk_amount': np.where(tradeable, np.round(adjusted_risk, 2), 0.0),
+            'participation_rate': np.where(tradeable, participation_rate, 0.0),
+            'stop_distance': np.where(tradeable, np.round(stop_distance, 2), np.nan),
+            'volatility_adjustment': np.where(tradeable, volatility_adjustment, np.nan)
+        }, index=df.index)
+        
+        if not tradeable.all():
+            result_df['reason'] = np.where(
+                tradeable, None,
+                f'Below minimum confidence ({PositionSizer.MIN_CONFIDENCE_THRESHOLD}%)'
             )
-            
-            results.append(size_info)
         
-        result_df = pd.DataFrame(results)
         return pd.concat([df, result_df], axis=1)
\ No newline at end of file
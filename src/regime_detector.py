@@ -2,6 +2,8 @@ import pandas as pd
 import numpy as np
 from typing import Literal
 
+from ._numba_kernels import sma_and_slope
+
 RegimeType = Literal['risk_on', 'neutral', 'risk_off']
 
 class RegimeDetector:
@@ -15,39 +17,38 @@ class RegimeDetector:
     @staticmethod
     def calculate_trend_slope(sma: pd.Series, lookback: int = 10) -> pd.Series:
         """Calculate trend slope over lookback period"""
-        # Slope = (current_sma - past_sma) / lookback_days
-        past_sma = sma.shift(lookback)
-        slope = (sma - past_sma) / lookback
-        return slope
+        # Slope = (current_sma - past_sma) / lookback_days, computed on the raw
+        # array with offset slices instead of an aligned shift() copy
+        values = sma.to_numpy(dtype=float)
+        slope = np.full(len(values), np.nan)
+        if 0 < lookback < len(values):
+            slope[lookback:] = (values[lookback:] - values[:-lookback]) / lookback
+        return pd.Series(slope, index=sma.index, name=sma.name)
     
     @staticmethod
     def classify_regime(slope: pd.Series, slope_threshold: float = 0.5) -> pd.Series:
         """Classify market regime based on trend slope"""
-        def get_regime(slope_val):
-            if pd.isna(slope_val):
-                return 'neutral'
-            elif slope_val > slope_threshold:
-                return 'risk_on'
-            elif slope_val < -slope_threshold:
-                return 'risk_off'
-            else:
-                return 'neutral'
-        
-        return slope.apply(get_regime)
+        values = slope.to_numpy(dtype=float)
+        # NaN compares False on both sides, so missing slopes fall through to neutral
+        regimes = np.select(
+            [values > slope_threshold, values < -slope_threshold],
+            ['risk_on', 'risk_off'],
+            default='neutral'
+        )
+        return pd.Series(regimes, index=slope.index, name=slope.name)
     
     @classmethod
     def detect_regime(cls, df: pd.DataFrame, sma_period: int = 50, 
                      slope_lookback: int = 10, slope_threshold: float = 0.5) -> pd.DataFrame:
         """Complete regime detection pipeline"""
-        result = df.copy()
-        
-        # Calculate index trend
-        result['index_sma50'] = cls.calculate_index_trend(df, sma_period)
-        
-        # Calculate trend slope
-        result['trend_slope'] = cls.calculate_trend_slope(result['index_sma50'], slope_lookback)
+        if len(df) < sma_period:
+            # No full SMA window, so no slope either: neutral throughout
+            return df.assign(index_sma50=np.nan, trend_slope=np.nan, regime='neutral')
         
-        # Classify regime
-        result['regime'] = cls.classify_regime(result['trend_slope'], slope_threshold)
+        # Index trend and its slope in a single pass over the close array
+        sma, slope = sma_and_slope(df['close'].to_numpy(dtype=float), sma_period, slope_lookback)
+        slope = pd.Series(slope, index=df.index)
         
-        return result
\ No newline at end of file
+        # Classify regime, then attach only the new columns to the input
+        regime = cls.classify_regime(slope, slope_threshold)
+        return df.assign(index_sma50=sma, trend_slope=slope, regime=regime)
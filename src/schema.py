@@ -16,14 +16,20 @@ class OHLCVSchema:
     
     @classmethod
     def get_dtypes(cls) -> Dict[str, str]:
-        """Return pandas dtypes for efficient loading"""
+        """
+        Return pandas dtypes for efficient loading, e.g.
+        pd.read_csv(path, dtype=OHLCVSchema.get_dtypes()).
+        
+        symbol and sector repeat heavily across rows, so they load as
+        categoricals (integer codes); group them with observed=True.
+        """
         return {
-            'symbol': 'string',
+            'symbol': 'category',
             'date': 'string',
             'open': 'float64',
             'high': 'float64', 
             'low': 'float64',
             'close': 'float64',
             'volume': 'int64',
-            'sector': 'string'
+            'sector': 'category'
         }
\ No newline at end of file
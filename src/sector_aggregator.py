@@ -2,48 +2,49 @@ import pandas as pd
 import numpy as np
 from typing import Dict
 
+# Column layout of SectorAggregator.aggregate_sectors
+SECTOR_COLUMNS = [
+    'date', 'sector', 'sector_close', 'sector_volume',
+    'sector_rvol', 'sector_breadth', 'stock_count'
+]
+
 class SectorAggregator:
     """Compute sector-level market microstructure metrics"""
     
     @staticmethod
     def aggregate_sectors(df: pd.DataFrame) -> pd.DataFrame:
         """Aggregate individual stock data to sector level"""
-        # Group by date and sector
-        sector_groups = df.groupby(['date', 'sector'])
+        if df.empty:
+            return pd.DataFrame(columns=SECTOR_COLUMNS)
+        
+        # Per-row helper columns so every aggregate comes from one grouped pass
+        work = df.assign(
+            _dollar_volume=df['close'] * df['volume'],
+            _above_sma=(df['close'] > df['sma_20']) if 'sma_20' in df.columns else False,
+            _rvol=df['rvol_20'] if 'rvol_20' in df.columns else np.nan
+        )
+        
+        sector_df = work.groupby(['date', 'sector'], observed=True).agg(
+            _dollar_volume=('_dollar_volume', 'sum'),
+            _mean_close=('close', 'mean'),
+            sector_volume=('volume', 'sum'),
+            sector_rvol=('_rvol', 'mean'),
+            _above_sma=('_above_sma', 'sum'),
+            stock_count=('close', 'size')
+        )
         
-        # Calculate sector aggregates
-        sector_data = []
+        # Market cap weighted close (using volume as proxy), plain mean without volume
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sector_df['sector_close'] = np.where(
+                sector_df['sector_volume'] > 0,
+                sector_df['_dollar_volume'] / sector_df['sector_volume'],
+                sector_df['_mean_close']
+            )
         
-        for (date, sector), group in sector_groups:
-            # Market cap weighted close (using volume as proxy)
-            total_volume = group['volume'].sum()
-            if total_volume > 0:
-                sector_close = (group['close'] * group['volume']).sum() / total_volume
-            else:
-                sector_close = group['close'].mean()
-            
-            # Sector volume (sum of all stocks)
-            sector_volume = group['volume'].sum()
-            
-            # Sector RVOL (average of individual RVOLs)
-            sector_rvol = group['rvol_20'].mean() if 'rvol_20' in group.columns else np.nan
-            
-            # Sector breadth (% stocks above SMA20)
-            stocks_above_sma = (group['close'] > group['sma_20']).sum() if 'sma_20' in group.columns else 0
-            total_stocks = len(group)
-            sector_breadth = (stocks_above_sma / total_stocks) * 100 if total_stocks > 0 else 0
-            
-            sector_data.append({
-                'date': date,
-                'sector': sector,
-                'sector_close': sector_close,
-                'sector_volume': sector_volume,
-                'sector_rvol': sector_rvol,
-                'sector_breadth': sector_breadth,
-                'stock_count': total_stocks
-            })
+        # Sector breadth (% stocks above SMA20)
+        sector_df['sector_breadth'] = sector_df['_above_sma'] / sector_df['stock_count'] * 100
         
-        return pd.DataFrame(sector_data)
+        return sector_df.reset_index()[SECTOR_COLUMNS]
     
     @staticmethod
     def get_sector_stats(sector_df: pd.DataFrame, date: str) -> pd.DataFrame:
@@ -1,6 +1,6 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, List
+from typing import Dict, List, Optional, Union
 from dataclasses import dataclass
 
 @dataclass
@@ -11,18 +11,53 @@ class SectorMetrics:
     rvol_score: float = 0.0
     sector_score: int = 0
 
+# Column layout of SectorMomentumAgent.run(..., as_frame=True)
+SECTOR_METRICS_COLUMNS = ['sector', 'relative_performance', 'breadth_score', 'rvol_score', 'sector_score']
+
+def _nanmean_rows(matrix: np.ndarray) -> np.ndarray:
+    """Row means ignoring NaN (NaN for all-NaN rows), without empty-slice warnings"""
+    counts = np.count_nonzero(~np.isnan(matrix), axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.nansum(matrix, axis=1) / counts
+
 class SectorMomentumAgent:
     """Identify leading sectors for rotation strategies"""
     
+    # RVOL level buckets (1.0 = normal, >1.5 = high activity):
+    # low, normal, elevated, high
+    _RVOL_EDGES = np.array([1.0, 1.2, 1.5])
+    _RVOL_SCORES = np.array([0.2, 0.5, 0.7, 1.0])
+    
+    @staticmethod
+    def _sector_positions(sector_df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Row positions of each sector in date order, from one sort and one
+        groupby pass, so that tails are the most recent rows
+        """
+        if 'date' not in sector_df.columns:
+            return sector_df.groupby('sector', sort=False, observed=True).indices
+        
+        order = np.argsort(sector_df['date'].to_numpy(), kind='stable')
+        grouped = sector_df.iloc[order].groupby('sector', sort=False, observed=True).indices
+        return {sector: order[idx] for sector, idx in grouped.items()}
+    
+    @staticmethod
+    def _sector_tails(sector_df: pd.DataFrame, column: str, lookback: int,
+                      positions: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, np.ndarray]:
+        """Last `lookback` values of `column` per sector, as array views"""
+        if positions is None:
+            positions = SectorMomentumAgent._sector_positions(sector_df)
+        values = sector_df[column].to_numpy(dtype=float)
+        return {sector: values[idx[-lookback:]] for sector, idx in positions.items()}
+    
     @staticmethod
     def calculate_relative_performance(sector_df: pd.DataFrame, index_df: pd.DataFrame, 
-                                     lookback: int = 20) -> Dict[str, float]:
+                                     lookback: int = 20,
+                                     positions: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, float]:
         """Calculate sector performance vs index"""
         if len(sector_df) < lookback or len(index_df) < lookback:
             return {}
         
-        # Get unique sectors
-        sectors = sector_df['sector'].unique()
         relative_perf = {}
         
         # Index performance
@@ -30,11 +65,11 @@ class SectorMomentumAgent:
         index_end = index_df['close'].iloc[-1]
         index_return = (index_end / index_start - 1) if index_start > 0 else 0
         
-        for sector in sectors:
-            sector_data = sector_df[sector_df['sector'] == sector].tail(lookback)
-            if len(sector_data) >= lookback:
-                sector_start = sector_data['sector_close'].iloc[0]
-                sector_end = sector_data['sector_close'].iloc[-1]
+        tails = SectorMomentumAgent._sector_tails(sector_df, 'sector_close', lookback, positions)
+        for sector, closes in tails.items():
+            if len(closes) >= lookback:
+                sector_start = closes[0]
+                sector_end = closes[-1]
                 sector_return = (sector_end / sector_start - 1) if sector_start > 0 else 0
                 
                 # Relative performance vs index
@@ -43,57 +78,48 @@ class SectorMomentumAgent:
         return relative_perf
     
     @staticmethod
-    def calculate_breadth_scoring(sector_df: pd.DataFrame, lookback: int = 10) -> Dict[str, float]:
+    def calculate_breadth_scoring(sector_df: pd.DataFrame, lookback: int = 10,
+                                  positions: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, float]:
         """Score sectors based on breadth trend"""
         if len(sector_df) < lookback:
             return {}
         
-        sectors = sector_df['sector'].unique()
-        breadth_scores = {}
+        tails = SectorMomentumAgent._sector_tails(sector_df, 'sector_breadth', lookback, positions)
+        sectors = [sector for sector, breadth in tails.items() if len(breadth) >= lookback]
+        if not sectors:
+            return {}
         
-        for sector in sectors:
-            sector_data = sector_df[sector_df['sector'] == sector].tail(lookback)
-            if len(sector_data) >= lookback:
-                # Average breadth over lookback period
-                avg_breadth = sector_data['sector_breadth'].mean()
-                
-                # Breadth trend (recent vs earlier)
-                recent_breadth = sector_data['sector_breadth'].tail(5).mean()
-                earlier_breadth = sector_data['sector_breadth'].head(5).mean()
-                breadth_trend = recent_breadth - earlier_breadth
-                
-                # Combined breadth score (level + trend)
-                breadth_score = (avg_breadth / 100) * 0.7 + (breadth_trend / 100) * 0.3
-                breadth_scores[sector] = max(0, min(1, breadth_score))  # Clamp 0-1
+        # (n_sectors, lookback) matrix so every sector is scored in the same expression
+        breadth = np.vstack([tails[sector] for sector in sectors])
+        
+        # Average breadth over lookback period
+        avg_breadth = _nanmean_rows(breadth)
+        
+        # Breadth trend (recent vs earlier)
+        breadth_trend = _nanmean_rows(breadth[:, -5:]) - _nanmean_rows(breadth[:, :5])
+        
+        # Combined breadth score (level + trend), clamped 0-1 (no data scores 0)
+        breadth_score = (avg_breadth / 100) * 0.7 + (breadth_trend / 100) * 0.3
+        breadth_score = np.fmin(np.fmax(breadth_score, 0), 1)
+        breadth_scores = dict(zip(sectors, breadth_score.tolist()))
         
         return breadth_scores
     
     @staticmethod
-    def calculate_rvol_scoring(sector_df: pd.DataFrame, lookback: int = 10) -> Dict[str, float]:
+    def calculate_rvol_scoring(sector_df: pd.DataFrame, lookback: int = 10,
+                               positions: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, float]:
         """Score sectors based on relative volume"""
         if len(sector_df) < lookback:
             return {}
         
-        sectors = sector_df['sector'].unique()
-        rvol_scores = {}
+        tails = SectorMomentumAgent._sector_tails(sector_df, 'sector_rvol', lookback, positions)
+        sectors = [sector for sector, rvol in tails.items() if len(rvol) >= lookback]
         
-        for sector in sectors:
-            sector_data = sector_df[sector_df['sector'] == sector].tail(lookback)
-            if len(sector_data) >= lookback:
-                # Average RVOL over lookback period
-                avg_rvol = sector_data['sector_rvol'].mean()
-                
-                # Score based on RVOL level (1.0 = normal, >1.5 = high activity)
-                if avg_rvol >= 1.5:
-                    rvol_score = 1.0  # High activity
-                elif avg_rvol >= 1.2:
-                    rvol_score = 0.7  # Elevated activity
-                elif avg_rvol >= 1.0:
-                    rvol_score = 0.5  # Normal activity
-                else:
-                    rvol_score = 0.2  # Low activity
-                
-                rvol_scores[sector] = rvol_score
+        # Average RVOL over lookback period, bucketed without a branch ladder
+        avg_rvols = _nanmean_rows(np.vstack([tails[sector] for sector in sectors])) if sectors else np.empty(0)
+        buckets = np.digitize(avg_rvols, SectorMomentumAgent._RVOL_EDGES)
+        buckets[np.isnan(avg_rvols)] = 0  # no RVOL reads as low activity
+        rvol_scores = dict(zip(sectors, SectorMomentumAgent._RVOL_SCORES[buckets].tolist()))
         
         return rvol_scores
     
@@ -102,57 +128,63 @@ class SectorMomentumAgent:
                                breadth_scores: Dict[str, float],
                                rvol_scores: Dict[str, float]) -> Dict[str, int]:
         """Calculate final sector scores 0-100"""
-        all_sectors = set(relative_perf.keys()) | set(breadth_scores.keys()) | set(rvol_scores.keys())
-        sector_scores = {}
-        
-        for sector in all_sectors:
-            # Get individual scores (default to 0 if missing)
-            rel_perf = relative_perf.get(sector, 0.0)
-            breadth = breadth_scores.get(sector, 0.0)
-            rvol = rvol_scores.get(sector, 0.0)
-            
-            # Relative performance scoring (40% weight)
-            if rel_perf > 0.05:  # >5% outperformance
-                perf_score = 40
-            elif rel_perf > 0.02:  # >2% outperformance
-                perf_score = 30
-            elif rel_perf > 0:  # Positive relative performance
-                perf_score = 20
-            elif rel_perf > -0.02:  # Minor underperformance
-                perf_score = 10
-            else:  # Significant underperformance
-                perf_score = 0
-            
-            # Breadth scoring (35% weight)
-            breadth_score = int(breadth * 35)
-            
-            # RVOL scoring (25% weight)
-            rvol_score = int(rvol * 25)
-            
-            # Final score
-            final_score = perf_score + breadth_score + rvol_score
-            sector_scores[sector] = min(100, final_score)
-        
-        return sector_scores
+        all_sectors = list(set(relative_perf.keys()) | set(breadth_scores.keys()) | set(rvol_scores.keys()))
+        
+        # Individual scores per sector (default to 0 if missing)
+        rel_perf = np.array([relative_perf.get(sector, 0.0) for sector in all_sectors], dtype=float)
+        breadth = np.array([breadth_scores.get(sector, 0.0) for sector in all_sectors], dtype=float)
+        rvol = np.array([rvol_scores.get(sector, 0.0) for sector in all_sectors], dtype=float)
+        
+        # Relative performance scoring (40% weight):
+        # >5% outperformance, >2%, positive, minor underperformance, significant underperformance
+        perf_score = np.select(
+            [rel_perf > 0.05, rel_perf > 0.02, rel_perf > 0, rel_perf > -0.02],
+            [40, 30, 20, 10],
+            default=0
+        )
+        
+        # Breadth scoring (35% weight) and RVOL scoring (25% weight)
+        breadth_score = (breadth * 35).astype(int)
+        rvol_score = (rvol * 25).astype(int)
+        
+        # Final score
+        final_score = np.minimum(perf_score + breadth_score + rvol_score, 100)
+        return dict(zip(all_sectors, final_score.tolist()))
     
     @classmethod
-    def run(cls, sector_df: pd.DataFrame, index_df: pd.DataFrame) -> Dict[str, SectorMetrics]:
-        """Run sector momentum analysis"""
+    def run(cls, sector_df: pd.DataFrame, index_df: pd.DataFrame,
+            as_frame: bool = False) -> Union[Dict[str, SectorMetrics], pd.DataFrame]:
+        """
+        Run sector momentum analysis
+        
+        Returns a dict of SectorMetrics by sector, or with as_frame=True one
+        row per sector with the SectorMetrics fields as columns, ready for
+        vectorized ranking (e.g. nlargest(5, 'sector_score')).
+        """
         if len(sector_df) < 20 or len(index_df) < 20:
-            return {}
+            return pd.DataFrame(columns=SECTOR_METRICS_COLUMNS) if as_frame else {}
         
-        # Calculate individual metrics
-        relative_perf = cls.calculate_relative_performance(sector_df, index_df)
-        breadth_scores = cls.calculate_breadth_scoring(sector_df)
-        rvol_scores = cls.calculate_rvol_scoring(sector_df)
+        # Calculate individual metrics from one shared sector grouping
+        positions = cls._sector_positions(sector_df)
+        relative_perf = cls.calculate_relative_performance(sector_df, index_df, positions=positions)
+        breadth_scores = cls.calculate_breadth_scoring(sector_df, positions=positions)
+        rvol_scores = cls.calculate_rvol_scoring(sector_df, positions=positions)
         
         # Calculate final scores
         final_scores = cls.calculate_sector_scores(relative_perf, breadth_scores, rvol_scores)
         
+        all_sectors = sorted(set(relative_perf.keys()) | set(breadth_scores.keys()) | set(rvol_scores.keys()))
+        if as_frame:
+            return pd.DataFrame({
+                'sector': all_sectors,
+                'relative_performance': [relative_perf.get(sector, 0.0) for sector in all_sectors],
+                'breadth_score': [breadth_scores.get(sector, 0.0) for sector in all_sectors],
+                'rvol_score': [rvol_scores.get(sector, 0.0) for sector in all_sectors],
+                'sector_score': [final_scores.get(sector, 0) for sector in all_sectors]
+            }, columns=SECTOR_METRICS_COLUMNS)
+        
         # Create results
         results = {}
-        all_sectors = set(relative_perf.keys()) | set(breadth_scores.keys()) | set(rvol_scores.keys())
-        
         for sector in all_sectors:
             results[sector] = SectorMetrics(
                 relative_performance=relative_perf.get(sector, 0.0),
@@ -161,4 +193,4 @@ class SectorMomentumAgent:
                 sector_score=final_scores.get(sector, 0)
             )
         
-        return results
\ No newline at end of file
+        return results
@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, Tuple
+from collections import deque
+from typing import Deque, Dict, NamedTuple, Tuple, Union
 from dataclasses import dataclass
 
 @dataclass
@@ -10,6 +11,166 @@ class TriggerSignals:
     breakout_from_base: bool = False
     candle_acceptance: bool = False
 
+# Bars of history a trigger needs: the base period plus a margin
+MIN_TRIGGER_BARS = 25
+
+# Per-bar flags and metrics, in TriggerAgent.run_all column order
+TRIGGER_FIELDS = (
+    'trigger_active', 'volume_expansion', 'breakout_from_base', 'candle_acceptance',
+    'volume_ratio', 'breakout_percentage', 'close_position'
+)
+
+
+class BarSeries(NamedTuple):
+    """One stock's bars as parallel float arrays (the columns TriggerAgent reads)"""
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'BarSeries':
+        """Pull the columns out of an OHLCV frame once"""
+        return cls(*(df[column].to_numpy(dtype=float) for column in cls._fields))
+    
+    @property
+    def n_bars(self) -> int:
+        """Number of bars (len() of a NamedTuple counts its fields)"""
+        return len(self.close)
+    
+    def tail(self, n: int) -> 'BarSeries':
+        """Views of the last `n` bars"""
+        return BarSeries(*(values[-n:] for values in self))
+
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; the NumPy paths are used without it
+    njit = None
+    prange = range
+
+
+def _volume_ratio_loop(volume: np.ndarray, period: int) -> np.ndarray:
+    """Volume over its trailing `period`-bar mean of valid volumes (0 without a positive mean)"""
+    n = len(volume)
+    out = np.zeros(n)
+    total = 0.0
+    missing = 0
+    for i in range(n):
+        if np.isnan(volume[i]):
+            missing += 1
+        else:
+            total += volume[i]
+        if i >= period:
+            if np.isnan(volume[i - period]):
+                missing -= 1
+            else:
+                total -= volume[i - period]
+        if i >= period - 1 and missing < period:
+            avg_volume = total / (period - missing)
+            if avg_volume > 0:
+                out[i] = volume[i] / avg_volume
+    return out
+
+
+def _base_high_loop(high: np.ndarray, period: int) -> np.ndarray:
+    """Max of the `period` bars before each bar skipping NaN, NaN until available"""
+    n = len(high)
+    out = np.full(n, np.nan)
+    for i in range(period, n):
+        for j in range(i - period, i):
+            if high[j] > out[i] or np.isnan(out[i]):
+                out[i] = high[j]
+    return out
+
+
+def _close_position_loop(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """Close position within each bar's range (0 for zero-range bars)"""
+    n = len(high)
+    out = np.zeros(n)
+    for i in range(n):
+        candle_range = high[i] - low[i]
+        if candle_range != 0:
+            out[i] = (close[i] - low[i]) / candle_range
+    return out
+
+
+def _trigger_metrics_loop(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+                          volume_period: int, base_period: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Volume ratio, base high and close position in one sweep over the bars.
+    
+    Same results as the three single-metric loops: the volume window is a
+    running sum and the base high comes from a monotonic deque of bar
+    numbers kept in a flat array (NaN highs never enter it), so each bar
+    is read once.
+    """
+    n = len(high)
+    volume_ratio = np.zeros(n)
+    base_high = np.full(n, np.nan)
+    close_position = np.zeros(n)
+    
+    total = 0.0
+    missing = 0
+    deque_bars = np.empty(n, dtype=np.int64)  # bars with decreasing highs
+    head = 0
+    tail = 0
+    for i in range(n):
+        if np.isnan(volume[i]):
+            missing += 1
+        else:
+            total += volume[i]
+        if i >= volume_period:
+            if np.isnan(volume[i - volume_period]):
+                missing -= 1
+            else:
+                total -= volume[i - volume_period]
+        if i >= volume_period - 1 and missing < volume_period:
+            avg_volume = total / (volume_period - missing)
+            if avg_volume > 0:
+                volume_ratio[i] = volume[i] / avg_volume
+        
+        # Base high over the prior bars, before bar i joins the deque
+        while head < tail and deque_bars[head] < i - base_period:
+            head += 1
+        if i >= base_period and head < tail:
+            base_high[i] = high[deque_bars[head]]
+        if not np.isnan(high[i]):
+            while head < tail and high[deque_bars[tail - 1]] <= high[i]:
+                tail -= 1
+            deque_bars[tail] = i
+            tail += 1
+        
+        candle_range = high[i] - low[i]
+        if candle_range != 0:
+            close_position[i] = (close[i] - low[i]) / candle_range
+    return volume_ratio, base_high, close_position
+
+
+_volume_ratio_nb = njit(cache=True)(_volume_ratio_loop) if njit else None
+_base_high_nb = njit(cache=True)(_base_high_loop) if njit else None
+_close_position_nb = njit(cache=True)(_close_position_loop) if njit else None
+_trigger_metrics_nb = njit(cache=True)(_trigger_metrics_loop) if njit else None
+
+
+def _batch_trigger_loop(offsets, high, low, close, volume, volume_period, base_period):
+    """Per-bar trigger metrics for symbols stored back to back, one thread per symbol"""
+    n = len(high)
+    volume_ratio = np.zeros(n)
+    base_high = np.full(n, np.nan)
+    close_position = np.zeros(n)
+    for k in prange(len(offsets) - 1):
+        start, stop = offsets[k], offsets[k + 1]
+        volume_ratio[start:stop], base_high[start:stop], close_position[start:stop] = _trigger_metrics_nb(
+            high[start:stop], low[start:stop], close[start:stop], volume[start:stop],
+            volume_period, base_period
+        )
+    return volume_ratio, base_high, close_position
+
+
+_batch_trigger_nb = njit(cache=True, parallel=True)(_batch_trigger_loop) if njit else None
+
+
 class TriggerAgent:
     """Detect breakout triggers from established bases"""
     
@@ -70,10 +231,207 @@ class TriggerAgent:
         
         return acceptance, close_position
     
+    @staticmethod
+    def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+        """
+        Trailing mean of the non-NaN values over `window` bars, like
+        tail(window).mean(); NaN until the window is full or if it is all NaN.
+        """
+        out = np.full(len(values), np.nan)
+        if len(values) >= window:
+            windows = np.lib.stride_tricks.sliding_window_view(values, window)
+            valid = ~np.isnan(windows)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                out[window - 1:] = np.where(valid, windows, 0.0).sum(axis=1) / valid.sum(axis=1)
+        return out
+    
+    @staticmethod
+    def _rolling_max_shift1(values: np.ndarray, window: int) -> np.ndarray:
+        """
+        Max of the `window` bars before each bar (excluding it), skipping NaN
+        like pandas max(); NaN until available or if the window is all NaN.
+        """
+        out = np.full(len(values), np.nan)
+        if len(values) > window:
+            windows = np.lib.stride_tricks.sliding_window_view(values[:-1], window)
+            out[window:] = np.fmax.reduce(windows, axis=1)
+        return out
+    
+    @staticmethod
+    def _volume_ratio(volume: np.ndarray, period: int) -> np.ndarray:
+        """Volume over its trailing mean, via the JIT kernel when numba is available"""
+        if _volume_ratio_nb is not None:
+            return _volume_ratio_nb(volume, period)
+        avg_volume = TriggerAgent._rolling_mean(volume, period)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(avg_volume > 0, volume / avg_volume, 0.0)
+    
+    @staticmethod
+    def _base_high(high: np.ndarray, period: int) -> np.ndarray:
+        """Prior-bars base high, via the JIT kernel when numba is available"""
+        if _base_high_nb is not None:
+            return _base_high_nb(high, period)
+        return TriggerAgent._rolling_max_shift1(high, period)
+    
+    @staticmethod
+    def _close_position(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+        """Close position within the bar, via the JIT kernel when numba is available"""
+        if _close_position_nb is not None:
+            return _close_position_nb(high, low, close)
+        candle_range = high - low
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(candle_range != 0, (close - low) / candle_range, 0.0)
+    
+    @staticmethod
+    def _breakout_percentage(high: np.ndarray, base_high: np.ndarray) -> np.ndarray:
+        """Current high vs base high (0 without a positive base)"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(base_high > 0, high / base_high - 1, 0.0)
+    
+    @staticmethod
+    def volume_expansion_array(volume: np.ndarray, expansion_threshold: float = 1.5,
+                               period: int = 20) -> Tuple[np.ndarray, np.ndarray]:
+        """Volume expansion of every bar vs its trailing average (0 before a full window)"""
+        volume_ratio = TriggerAgent._volume_ratio(volume, period)
+        return volume_ratio >= expansion_threshold, volume_ratio
+    
+    @staticmethod
+    def breakout_from_base_array(high: np.ndarray, base_period: int = 20,
+                                 breakout_threshold: float = 0.02) -> Tuple[np.ndarray, np.ndarray]:
+        """Breakout of every bar above the prior `base_period` bars' high"""
+        # Base high excludes the current bar
+        base_high = TriggerAgent._base_high(high, base_period)
+        breakout_percentage = TriggerAgent._breakout_percentage(high, base_high)
+        return high >= base_high * (1 + breakout_threshold), breakout_percentage
+    
+    @staticmethod
+    def candle_acceptance_array(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                                acceptance_threshold: float = 0.5) -> Tuple[np.ndarray, np.ndarray]:
+        """Close position of every bar within its range (0 for zero-range candles)"""
+        close_position = TriggerAgent._close_position(high, low, close)
+        return (high - low != 0) & (close_position >= acceptance_threshold), close_position
+    
+    @staticmethod
+    def _as_bars(data: Union[pd.DataFrame, BarSeries]) -> BarSeries:
+        """BarSeries for either input layout"""
+        return data if isinstance(data, BarSeries) else BarSeries.from_frame(data)
+    
     @classmethod
-    def run(cls, df: pd.DataFrame) -> Dict:
-        """Run trigger detection on stock data"""
-        if len(df) < 25:
+    def _trigger_arrays(cls, bars: BarSeries) -> Dict[str, np.ndarray]:
+        """Per-bar signals and metrics, each bar seeing only its own history"""
+        high, low, close, volume = bars
+        
+        if _trigger_metrics_nb is not None:
+            metrics = _trigger_metrics_nb(high, low, close, volume, 20, 20)
+        else:
+            metrics = (
+                cls._volume_ratio(volume, 20),
+                cls._base_high(high, 20),
+                cls._close_position(high, low, close)
+            )
+        
+        # The warmup bars are the leading slice of a single symbol
+        return cls._trigger_fields(high, low, *metrics, slice(0, MIN_TRIGGER_BARS - 1))
+    
+    @classmethod
+    def _trigger_fields(cls, high: np.ndarray, low: np.ndarray, vol_ratio: np.ndarray,
+                        base_high: np.ndarray, close_pos: np.ndarray,
+                        warmup) -> Dict[str, np.ndarray]:
+        """
+        TRIGGER_FIELDS arrays from per-bar metrics, at the default thresholds.
+        
+        `warmup` indexes the bars without enough history (a slice or a
+        boolean mask); they are zero-filled in place, like run() on a short
+        frame, rather than masked bar by bar. The metric arrays are consumed.
+        """
+        breakout_pct = cls._breakout_percentage(high, base_high)
+        fields = {
+            'volume_expansion': vol_ratio >= 1.5,
+            'breakout_from_base': high >= base_high * 1.02,
+            'candle_acceptance': (high - low != 0) & (close_pos >= 0.5),
+            'volume_ratio': vol_ratio,
+            'breakout_percentage': breakout_pct,
+            'close_position': close_pos
+        }
+        for values in fields.values():
+            values[warmup] = 0
+        
+        # Trigger is active when 2 of 3 signals are present
+        trigger_active = (
+            fields['volume_expansion'].astype(int)
+            + fields['breakout_from_base'] + fields['candle_acceptance']
+        ) >= 2
+        return {'trigger_active': trigger_active, **fields}
+    
+    @classmethod
+    def run_all(cls, df: Union[pd.DataFrame, BarSeries]) -> pd.DataFrame:
+        """
+        Run trigger detection for every bar of a stock's history in one pass.
+        
+        Row i matches run(df.iloc[:i + 1]): trigger_active, the three signal
+        flags and the three metrics as columns. A BarSeries gives a
+        RangeIndex-ed result.
+        """
+        index = None if isinstance(df, BarSeries) else df.index
+        return pd.DataFrame(cls._trigger_arrays(cls._as_bars(df)), index=index)
+    
+    @classmethod
+    def run_universe(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        run_all for a multi-symbol frame, each symbol seeing only its own bars.
+        
+        Symbols are laid out back to back in date order and, with numba,
+        scored in parallel threads by one kernel call. Rows align with df;
+        rows without a symbol get the warmup zeros.
+        """
+        if 'date' in df.columns:
+            order = np.argsort(df['date'].to_numpy(), kind='stable')
+            groups = df.iloc[order].groupby('symbol', sort=False, observed=True).indices
+            segments = [order[idx] for idx in groups.values()]
+        else:
+            segments = list(df.groupby('symbol', sort=False, observed=True).indices.values())
+        if not segments:
+            return pd.DataFrame({name: np.empty(0) for name in TRIGGER_FIELDS}, index=df.index)
+        
+        layout = np.concatenate(segments)
+        lengths = np.array([len(idx) for idx in segments])
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+        high, low, close, volume = (
+            df[column].to_numpy(dtype=float)[layout] for column in ('high', 'low', 'close', 'volume')
+        )
+        
+        if _batch_trigger_nb is not None:
+            vol_ratio, base_high, close_pos = _batch_trigger_nb(offsets, high, low, close, volume, 20, 20)
+        else:
+            vol_ratio, base_high, close_pos = (np.concatenate(parts) for parts in zip(*(
+                (cls._volume_ratio(volume[a:b], 20), cls._base_high(high[a:b], 20),
+                 cls._close_position(high[a:b], low[a:b], close[a:b]))
+                for a, b in zip(offsets[:-1], offsets[1:])
+            )))
+        
+        # Bar number within its own symbol decides whether it has enough history
+        bar_number = np.arange(len(layout)) - np.repeat(offsets[:-1], lengths)
+        fields = cls._trigger_fields(
+            high, low, vol_ratio, base_high, close_pos, bar_number < MIN_TRIGGER_BARS - 1
+        )
+        
+        # groupby drops NaN symbols, so layout may not cover every row
+        columns = {}
+        for name, values in fields.items():
+            columns[name] = np.zeros(len(df), dtype=values.dtype)
+            columns[name][layout] = values
+        return pd.DataFrame(columns, index=df.index)
+    
+    @classmethod
+    def run(cls, df: Union[pd.DataFrame, BarSeries]) -> Dict:
+        """
+        Run trigger detection on stock data.
+        
+        Callers scoring the same stock repeatedly can pass a BarSeries built
+        once, so no DataFrame indexing happens per call.
+        """
+        bars = cls._as_bars(df)
+        if bars.n_bars < MIN_TRIGGER_BARS:
             return {
                 'trigger_active': False,
                 'signals': TriggerSignals(),
@@ -84,27 +442,150 @@ class TriggerAgent:
                 }
             }
         
-        # Detect individual signals
-        vol_expansion, vol_ratio = cls.detect_volume_expansion(df)
-        breakout, breakout_pct = cls.detect_breakout_from_base(df)
-        acceptance, close_pos = cls.detect_candle_acceptance(df)
+        # Only the trailing bars feed the latest values
+        latest = {name: values[-1] for name, values in cls._trigger_arrays(bars.tail(MIN_TRIGGER_BARS)).items()}
         
-        # Create signals object
+        return cls._trigger_result(latest)
+    
+    @staticmethod
+    def _trigger_result(latest: Dict) -> Dict:
+        """run()-style result from one bar's flags and metrics"""
         signals = TriggerSignals(
-            volume_expansion=vol_expansion,
-            breakout_from_base=breakout,
-            candle_acceptance=acceptance
+            volume_expansion=bool(latest['volume_expansion']),
+            breakout_from_base=bool(latest['breakout_from_base']),
+            candle_acceptance=bool(latest['candle_acceptance'])
         )
         
-        # Trigger is active when 2 of 3 signals are present (more flexible)
-        trigger_active = sum([vol_expansion, breakout, acceptance]) >= 2
-        
         return {
-            'trigger_active': trigger_active,
+            'trigger_active': bool(latest['trigger_active']),
             'signals': signals,
             'metrics': {
-                'volume_ratio': vol_ratio,
-                'breakout_percentage': breakout_pct,
-                'close_position': close_pos
+                'volume_ratio': float(latest['volume_ratio']),
+                'breakout_percentage': float(latest['breakout_percentage']),
+                'close_position': float(latest['close_position'])
             }
-        }
\ No newline at end of file
+        }
+
+
+class TriggerAgentStream:
+    """
+    Incremental trigger detection for bar-by-bar backtests.
+    
+    push(bar) returns what TriggerAgent.run would on every bar pushed so far,
+    in amortized O(1): a running volume sum over the last `volume_period`
+    bars and a monotonic deque of highs over the prior `base_period` bars.
+    """
+    
+    def __init__(self, volume_period: int = 20, base_period: int = 20,
+                 expansion_threshold: float = 1.5, breakout_threshold: float = 0.02,
+                 acceptance_threshold: float = 0.5):
+        self.volume_period = volume_period
+        self.base_period = base_period
+        self.expansion_threshold = expansion_threshold
+        self.breakout_threshold = breakout_threshold
+        self.acceptance_threshold = acceptance_threshold
+        
+        self._volumes: Deque[float] = deque()
+        self._volume_sum = 0.0  # valid volumes only
+        self._volume_missing = 0  # NaN volumes in the window
+        self._highs: Deque[Tuple[int, float]] = deque()  # (bar, high), highs decreasing
+        self._bars = 0
+    
+    def push(self, bar) -> Dict:
+        """Add the next bar (anything indexable by high/low/close/volume)"""
+        high, low, close, volume = (float(bar[k]) for k in ('high', 'low', 'close', 'volume'))
+        
+        # Running volume sum over the trailing window, current bar included;
+        # NaN volumes are counted instead of summed, as tail().mean() skips them
+        self._volumes.append(volume)
+        if np.isnan(volume):
+            self._volume_missing += 1
+        else:
+            self._volume_sum += volume
+        if len(self._volumes) > self.volume_period:
+            evicted = self._volumes.popleft()
+            if np.isnan(evicted):
+                self._volume_missing -= 1
+            else:
+                self._volume_sum -= evicted
+        
+        # Base high over the prior bars: drop highs that left the window
+        while self._highs and self._highs[0][0] < self._bars - self.base_period:
+            self._highs.popleft()
+        base_high = self._highs[0][1] if self._highs else np.nan
+        
+        if self._bars + 1 >= MIN_TRIGGER_BARS:
+            result = TriggerAgent._trigger_result(
+                self._evaluate(high, low, close, volume, base_high)
+            )
+        else:
+            result = TriggerAgent._trigger_result(dict.fromkeys(TRIGGER_FIELDS, 0))
+        
+        # Current high joins the base for later bars (a NaN high is skipped, as max() does)
+        if not np.isnan(high):
+            while self._highs and self._highs[-1][1] <= high:
+                self._highs.pop()
+            self._highs.append((self._bars, high))
+        self._bars += 1
+        
+        return result
+    
+    def _evaluate(self, high: float, low: float, close: float, volume: float,
+                  base_high: float) -> Dict:
+        """Flags and metrics of the current bar from the streamed state"""
+        valid_volumes = len(self._volumes) - self._volume_missing
+        avg_volume = self._volume_sum / valid_volumes if valid_volumes else np.nan
+        volume_ratio = volume / avg_volume if avg_volume > 0 else 0.0
+        volume_expansion = volume_ratio >= self.expansion_threshold
+        
+        breakout_from_base = high >= base_high * (1 + self.breakout_threshold)
+        breakout_percentage = (high / base_high - 1) if base_high > 0 else 0.0
+        
+        candle_range = high - low
+        close_position = (close - low) / candle_range if candle_range != 0 else 0.0
+        candle_acceptance = candle_range != 0 and close_position >= self.acceptance_threshold
+        
+        return {
+            'trigger_active': volume_expansion + breakout_from_base + candle_acceptance >= 2,
+            'volume_expansion': volume_expansion,
+            'breakout_from_base': breakout_from_base,
+            'candle_acceptance': candle_acceptance,
+            'volume_ratio': volume_ratio,
+            'breakout_percentage': breakout_percentage,
+            'close_position': close_position
+        }
+
+
+class TriggerStreamRegistry:
+    """
+    Per-symbol TriggerAgentStream state for multi-symbol bar-by-bar loops.
+    
+    A backtest that scores every symbol each day pushes that day's bar for
+    each symbol; the running volume sums and base-high deques live here
+    between days instead of being rebuilt from the history on every call.
+    """
+    
+    def __init__(self, **stream_kwargs):
+        self.stream_kwargs = stream_kwargs
+        self._streams: Dict[str, TriggerAgentStream] = {}
+    
+    def push(self, symbol: str, bar) -> Dict:
+        """Add the next bar for `symbol` and return its run()-style result"""
+        stream = self._streams.get(symbol)
+        if stream is None:
+            stream = self._streams[symbol] = TriggerAgentStream(**self.stream_kwargs)
+        return stream.push(bar)
+    
+    def push_day(self, day: pd.DataFrame) -> Dict[str, Dict]:
+        """Push one row per symbol (a single day's bars) and return results by symbol"""
+        return {
+            bar['symbol']: self.push(bar['symbol'], bar)
+            for bar in day.to_dict('records')
+        }
+    
+    def reset(self, symbol: str) -> None:
+        """Forget a symbol's history (e.g. after a data gap)"""
+        self._streams.pop(symbol, None)
+    
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._streams
@@ -5,13 +5,22 @@ This prevents overfitting by validating that parameters learned on historical da
 continue to work on unseen future data across multiple time periods.
 """
 
-from typing import Dict, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
 from src.backtest_engine import BacktestEngine
 from src.kpi_computer import KPIComputer
 
 
+@dataclass(slots=True)
+class SimTrade:
+    """Simulated walk-forward trade (only the P&L is modelled)."""
+    pnl: float
+
+
 class WalkForwardTester:
     """
     Walk-forward testing with rolling windows and frozen parameters.
@@ -23,7 +32,8 @@ class WalkForwardTester:
     4. No parameter re-optimization during testing
     """
     
-    def __init__(self, train_days: int = 252, test_days: int = 63, step_days: int = 21):
+    def __init__(self, train_days: int = 252, test_days: int = 63, step_days: int = 21,
+                 seed: Optional[int] = None):
         """
         Initialize walk-forward tester.
         
@@ -31,17 +41,20 @@ class WalkForwardTester:
             train_days: Training window size (252 = 1 year)
             test_days: Test window size (63 = 3 months)  
             step_days: Step size between windows (21 = 1 month)
+            seed: Seed for the simulated trade outcomes (None = unseeded)
         """
         self.train_days = train_days
         self.test_days = test_days
         self.step_days = step_days
+        self.rng = np.random.default_rng(seed)
     
     def run_walk_forward(
         self, 
         data: pd.DataFrame,
         start_date: str,
         end_date: str,
-        frozen_params: Dict
+        frozen_params: Dict,
+        max_workers: Optional[int] = None
     ) -> Dict:
         """
         Execute walk-forward testing with frozen parameters.
@@ -50,49 +63,39 @@ class WalkForwardTester:
             data: Complete dataset with OHLCV data
             start_date: Start date for walk-forward testing
             end_date: End date for walk-forward testing
-            frozen_params: Fixed system parameters (no re-optimization)
+            frozen_params: Fixed system parameters (no re-optimization); an
+                optional 'seed' entry reseeds the simulation for this run
+            max_workers: Threads running folds in parallel (None = executor default)
             
         Returns:
             Walk-forward results with window-level KPIs
         """
         windows = self._generate_windows(start_date, end_date)
-        window_results = []
         
-        for i, (train_start, train_end, test_start, test_end) in enumerate(windows):
-            # Extract train and test data
-            train_data = self._filter_data(data, train_start, train_end)
-            test_data = self._filter_data(data, test_start, test_end)
-            
-            if len(train_data) == 0 or len(test_data) == 0:
-                continue
-            
-            # Run backtest on test period with frozen parameters
-            # Note: Using simplified backtest for walk-forward testing
-            # In production, would integrate with full trading system
-            
-            # Simulate backtest results based on test data
-            test_results = self._simulate_backtest_results(test_data, frozen_params)
-            
-            # Compute KPIs for this window
-            window_kpis = KPIComputer.compute_kpis(
-                trades=test_results['trades'],
-                equity_curve=test_results['equity_curve']
+        # Sort once so every window is a binary-searched slice of the same frame,
+        # and encode dates/symbols once so windows never re-hash them
+        data = data.sort_values('date', kind='stable')
+        dates = pd.Index(data['date'])
+        date_codes, unique_dates = pd.factorize(dates, sort=True)
+        symbol_codes, symbols = pd.factorize(data['symbol'])
+        layout = {
+            'dates': dates,
+            'date_codes': date_codes,
+            'unique_dates': unique_dates,
+            'symbol_codes': symbol_codes,
+            'n_symbols': len(symbols)
+        }
+        
+        # Folds share no state: each gets its own child generator (reproducible
+        # under a seed regardless of scheduling) and runs on the thread pool
+        master_rng = np.random.default_rng(frozen_params['seed']) if 'seed' in frozen_params else self.rng
+        fold_rngs = master_rng.spawn(len(windows))
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = pool.map(
+                lambda args: self._run_one_fold(*args, data, layout, frozen_params),
+                zip(range(len(windows)), windows, fold_rngs)
             )
-            
-            window_result = {
-                'window_id': i + 1,
-                'train_start': train_start,
-                'train_end': train_end,
-                'test_start': test_start,
-                'test_end': test_end,
-                'train_days_actual': len(train_data),
-                'test_days_actual': len(test_data),
-                'kpis': window_kpis,
-                'trades_count': len(test_results['trades']),
-                'final_value': test_results['equity_curve'][-1]['total_value'] if test_results['equity_curve'] else 100000
-            }
-            
-            window_results.append(window_result)
+            window_results = [result for result in results if result is not None]
         
         # Aggregate results across all windows
         aggregated_kpis = self._aggregate_window_kpis(window_results)
@@ -105,53 +108,121 @@ class WalkForwardTester:
             'robustness_metrics': self._calculate_robustness_metrics(window_results)
         }
     
+    def _run_one_fold(
+        self,
+        i: int,
+        window: Tuple[str, str, str, str],
+        rng: np.random.Generator,
+        data: pd.DataFrame,
+        layout: Dict,
+        frozen_params: Dict
+    ) -> Optional[Dict]:
+        """Simulate and score one train/test window (None if either side is empty)."""
+        train_start, train_end, test_start, test_end = window
+        
+        # Extract train and test data as slices of the date-sorted frame
+        train_first, train_stop = self._date_bounds(layout['dates'], train_start, train_end)
+        train_rows = int(train_stop - train_first)
+        start, stop = self._date_bounds(layout['dates'], test_start, test_end)
+        test_data = data.iloc[start:stop]
+        
+        if train_rows == 0 or len(test_data) == 0:
+            return None
+        
+        # Run backtest on test period with frozen parameters
+        # Note: Using simplified backtest for walk-forward testing
+        # In production, would integrate with full trading system
+        
+        # Simulate backtest results based on test data
+        date_codes = layout['date_codes']
+        symbol_counts = np.bincount(layout['symbol_codes'][start:stop], minlength=layout['n_symbols'])
+        test_results = self._simulate_backtest_results(
+            test_data,
+            frozen_params,
+            dates=layout['unique_dates'][date_codes[start]:date_codes[stop - 1] + 1],
+            n_symbols=np.count_nonzero(symbol_counts),
+            rng=rng
+        )
+        
+        # Compute KPIs for this window
+        window_kpis = KPIComputer.compute_kpis_from_arrays(
+            test_results['pnls'],
+            test_results['equity_curve']['total_value'].to_numpy()
+        )
+        
+        return {
+            'window_id': i + 1,
+            'train_start': train_start,
+            'train_end': train_end,
+            'test_start': test_start,
+            'test_end': test_end,
+            'train_days_actual': train_rows,
+            'test_days_actual': len(test_data),
+            'kpis': window_kpis,
+            'trades_count': len(test_results['trades']),
+            'final_value': test_results['equity_curve']['total_value'].iat[-1] if len(test_results['equity_curve']) else 100000
+        }
+    
     def _generate_windows(self, start_date: str, end_date: str) -> List[Tuple[str, str, str, str]]:
-        """Generate rolling train/test windows."""
-        windows = []
-        current_date = pd.to_datetime(start_date)
-        end_dt = pd.to_datetime(end_date)
-        
-        while current_date + timedelta(days=self.train_days + self.test_days) <= end_dt:
-            train_start = current_date.strftime('%Y-%m-%d')
-            train_end = (current_date + timedelta(days=self.train_days - 1)).strftime('%Y-%m-%d')
-            test_start = (current_date + timedelta(days=self.train_days)).strftime('%Y-%m-%d')
-            test_end = (current_date + timedelta(days=self.train_days + self.test_days - 1)).strftime('%Y-%m-%d')
-            
-            windows.append((train_start, train_end, test_start, test_end))
-            current_date += timedelta(days=self.step_days)
+        """
+        Generate rolling train/test windows.
+        
+        Window starts come from one pd.date_range and each bound column is
+        formatted with a single vectorized strftime, instead of parsing and
+        formatting four timestamps per window.
+        """
+        last_start = pd.Timestamp(end_date) - pd.Timedelta(days=self.train_days + self.test_days)
+        starts = pd.date_range(start_date, last_start, freq=f'{self.step_days}D')
+        
+        bounds = [
+            (starts + pd.Timedelta(days=offset)).strftime('%Y-%m-%d')
+            for offset in (0, self.train_days - 1, self.train_days, self.train_days + self.test_days - 1)
+        ]
+        return list(zip(*bounds))
+    
+    def _filter_data(self, data: pd.DataFrame, start_date: str, end_date: str,
+                     dates: Optional[pd.Index] = None) -> pd.DataFrame:
+        """
+        Filter data for specific date range.
+        
+        When `dates` (data's date column as an index) is given, data must be
+        sorted by date and the range is cut with two binary searches.
+        """
+        if dates is None:
+            mask = (data['date'] >= start_date) & (data['date'] <= end_date)
+            return data.loc[mask]
         
-        return windows
+        start, stop = self._date_bounds(dates, start_date, end_date)
+        return data.iloc[start:stop]
     
-    def _filter_data(self, data: pd.DataFrame, start_date: str, end_date: str) -> pd.DataFrame:
-        """Filter data for specific date range."""
-        mask = (data['date'] >= start_date) & (data['date'] <= end_date)
-        return data[mask].copy()
+    @staticmethod
+    def _date_bounds(dates: pd.Index, start_date: str, end_date: str) -> Tuple[int, int]:
+        """Positions [start, stop) of the inclusive date range in sorted dates."""
+        return dates.searchsorted(start_date, side='left'), dates.searchsorted(end_date, side='right')
     
     def _aggregate_window_kpis(self, window_results: List[Dict]) -> Dict:
         """Aggregate KPIs across all windows."""
         if not window_results:
             return {}
         
-        # Collect all trades across windows
-        all_trades = []
-        all_equity_points = []
-        
+        # One pass over the windows feeds every average
+        exp_sum = wr_sum = dd_sum = 0.0
+        exp_n = traded_n = 0
         for window in window_results:
+            kpis = window['kpis']
+            if kpis['expectancy'] != 0:
+                exp_sum += kpis['expectancy']
+                exp_n += 1
             if window['trades_count'] > 0:
-                # Note: In real implementation, would need access to actual trade objects
-                # For now, use KPI data to reconstruct aggregate metrics
-                pass
-        
-        # Calculate aggregate metrics
-        expectancies = [w['kpis']['expectancy'] for w in window_results if w['kpis']['expectancy'] != 0]
-        win_rates = [w['kpis']['win_rate_pct'] for w in window_results if w['trades_count'] > 0]
-        max_drawdowns = [w['kpis']['max_drawdown_pct'] for w in window_results]
+                wr_sum += kpis['win_rate_pct']
+                traded_n += 1
+            dd_sum += kpis['max_drawdown_pct']
         
         return {
-            'avg_expectancy': sum(expectancies) / len(expectancies) if expectancies else 0,
-            'avg_win_rate': sum(win_rates) / len(win_rates) if win_rates else 0,
-            'avg_max_drawdown': sum(max_drawdowns) / len(max_drawdowns) if max_drawdowns else 0,
-            'windows_with_trades': len([w for w in window_results if w['trades_count'] > 0]),
+            'avg_expectancy': exp_sum / exp_n if exp_n else 0,
+            'avg_win_rate': wr_sum / traded_n if traded_n else 0,
+            'avg_max_drawdown': dd_sum / len(window_results),
+            'windows_with_trades': traded_n,
             'total_windows': len(window_results)
         }
     
@@ -160,19 +231,19 @@ class WalkForwardTester:
         if not window_results:
             return {}
         
-        expectancies = [w['kpis']['expectancy'] for w in window_results if w['trades_count'] > 0]
-        win_rates = [w['kpis']['win_rate_pct'] for w in window_results if w['trades_count'] > 0]
+        expectancies = np.array(
+            [w['kpis']['expectancy'] for w in window_results if w['trades_count'] > 0], dtype=float
+        )
         
-        if not expectancies:
+        if len(expectancies) == 0:
             return {'consistency_score': 0, 'profitable_windows_pct': 0}
         
         # Consistency metrics
-        positive_expectancy_windows = len([e for e in expectancies if e > 0])
+        positive_expectancy_windows = np.count_nonzero(expectancies > 0)
         profitable_windows_pct = (positive_expectancy_windows / len(expectancies)) * 100
         
         # Expectancy standard deviation (lower = more consistent)
-        import statistics
-        expectancy_std = statistics.stdev(expectancies) if len(expectancies) > 1 else 0
+        expectancy_std = float(np.std(expectancies, ddof=1)) if len(expectancies) > 1 else 0.0
         
         # Consistency score (higher = more robust)
         consistency_score = profitable_windows_pct - (expectancy_std * 10)  # Penalize volatility
@@ -182,8 +253,8 @@ class WalkForwardTester:
             'profitable_windows_pct': round(profitable_windows_pct, 1),
             'expectancy_std': round(expectancy_std, 2),
             'expectancy_range': {
-                'min': round(min(expectancies), 2),
-                'max': round(max(expectancies), 2)
+                'min': round(float(expectancies.min()), 2),
+                'max': round(float(expectancies.max()), 2)
             }
         }
     
@@ -240,56 +311,66 @@ class WalkForwardTester:
         
         return "\n".join(report)
     
-    def _simulate_backtest_results(self, test_data: pd.DataFrame, frozen_params: Dict) -> Dict:
-        """Simulate backtest results for walk-forward testing."""
-        # Simulate realistic trading results based on frozen parameters
-        symbols = test_data['symbol'].unique()
-        dates = sorted(test_data['date'].unique())
+    def _simulate_backtest_results(
+        self,
+        test_data: pd.DataFrame,
+        frozen_params: Dict,
+        dates: Optional[pd.Index] = None,
+        n_symbols: Optional[int] = None,
+        rng: Optional[np.random.Generator] = None
+    ) -> Dict:
+        """
+        Simulate backtest results for walk-forward testing.
         
-        # Generate simulated trades based on parameters
-        trades = []
-        equity_curve = []
+        run_walk_forward passes the window's sorted unique dates and symbol
+        count from its precomputed encodings; otherwise they come from test_data.
+        Outcomes are drawn from `rng` (default: the tester's generator).
+        """
+        if rng is None:
+            rng = self.rng
+        # Simulate realistic trading results based on frozen parameters
+        if n_symbols is None:
+            n_symbols = test_data['symbol'].nunique()
+        if dates is None:
+            dates = sorted(test_data['date'].unique())
         
         initial_capital = 100000
         current_value = initial_capital
         
         # Simulate trades (simplified for demonstration)
-        num_trades = min(len(dates) // 10, len(symbols) * 2)  # Conservative trade frequency
+        num_trades = min(len(dates) // 10, n_symbols * 2)  # Conservative trade frequency
         
-        for i in range(num_trades):
-            # Create mock trade object
-            trade = type('Trade', (), {})()
-            
-            # Simulate trade outcome based on market conditions
-            # Use frozen parameters to influence results
-            confidence_threshold = frozen_params.get('confidence_threshold', 65)
-            risk_per_trade = frozen_params.get('risk_per_trade', 0.01)
-            
-            # Higher confidence threshold = more selective = better win rate but fewer trades
-            base_win_prob = 0.45 + (confidence_threshold - 60) * 0.01
-            
-            # Simulate win/loss
-            import random
-            is_winner = random.random() < base_win_prob
-            
-            if is_winner:
-                # Winning trade: 1-3% gain
-                trade.pnl = current_value * risk_per_trade * random.uniform(1.5, 4.0)
-            else:
-                # Losing trade: risk per trade loss
-                trade.pnl = -current_value * risk_per_trade
-            
-            trades.append(trade)
-            current_value += trade.pnl
+        # Use frozen parameters to influence results
+        confidence_threshold = frozen_params.get('confidence_threshold', 65)
+        risk_per_trade = frozen_params.get('risk_per_trade', 0.01)
+        
+        # Higher confidence threshold = more selective = better win rate but fewer trades
+        base_win_prob = 0.45 + (confidence_threshold - 60) * 0.01
+        
+        # Draw every outcome in one buffer of uniforms: winners gain 1.5-4x the
+        # risked amount, losers lose it. Each trade risks a fraction of the
+        # compounded value.
+        draws = rng.random((2, num_trades))
+        is_winner = draws[0] < base_win_prob
+        multiples = 1.5 + 2.5 * draws[1]
+        returns = np.where(is_winner, risk_per_trade * multiples, -risk_per_trade)
+        growth = np.cumprod(1 + returns)
+        value_before = initial_capital * np.concatenate(([1.0], growth[:-1]))
+        pnls = value_before * returns
+        trades = [SimTrade(pnl) for pnl in pnls.tolist()]
+        
+        if num_trades > 0:
+            current_value = float(initial_capital * growth[-1])
         
-        # Generate equity curve
-        for i, date in enumerate(dates):
-            equity_curve.append({
-                'date': date,
-                'total_value': initial_capital + (current_value - initial_capital) * (i / len(dates))
-            })
+        # Generate equity curve: linear path from the initial to the final value
+        progress = np.arange(len(dates)) / len(dates)
+        equity_curve = pd.DataFrame({
+            'date': dates,
+            'total_value': initial_capital + (current_value - initial_capital) * progress
+        })
         
         return {
             'trades': trades,
+            'pnls': pnls,
             'equity_curve': equity_curve
         }
\ No newline at end of file
@@ -6,187 +6,157 @@ from datetime import datetime
 from src.features import FeatureComputer
 from src.accumulation_agent import AccumulationAgent
 
+# Trading days shared by every synthetic series
+_DATES_50 = pd.date_range('2024-01-01', periods=50)
+
+# Pinned sector-relative result for the seeded accumulation stock; update
+# when the agent's scoring logic changes
+EXPECTED_ACCUM_SCORE = 60
+EXPECTED_ACCUM_EVIDENCE = (False, False, True, True)
+
 class TestAccumulationIntegration:
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def accumulation_stock_data(self):
         """Create stock showing accumulation pattern"""
-        np.random.seed(42)
-        dates = pd.date_range('2024-01-01', periods=50)
-        
-        data = []
-        base_price = 100.0
-        
-        for i, date in enumerate(dates):
-            if i < 20:
-                # Normal phase
-                price_change = np.random.normal(0, 0.02)
-                volume = 1000000 + np.random.normal(0, 200000)
-                range_mult = 1.0
-            else:
-                # Accumulation phase: tight range, high volume
-                price_change = np.random.normal(0, 0.005)  # Low volatility
-                volume = 2000000 + np.random.normal(0, 300000)  # High volume
-                range_mult = 0.3  # Tight ranges
-            
-            base_price *= (1 + price_change)
-            
-            # Generate OHLC
-            range_size = base_price * 0.03 * range_mult
-            high = base_price + range_size
-            low = base_price - range_size
-            
-            data.append({
-                'symbol': 'ACCUM',
-                'date': date,
-                'open': base_price,
-                'high': high,
-                'low': low,
-                'close': base_price,
-                'volume': max(int(volume), 100000),
-                'sector': 'Technology'
-            })
-        
-        return pd.DataFrame(data)
+        rng = np.random.default_rng(42)
+        
+        # Normal phase for 20 bars, then accumulation: tight range, high volume
+        accumulating = np.arange(50) >= 20
+        price_changes = np.where(accumulating, rng.normal(0, 0.005, 50), rng.normal(0, 0.02, 50))
+        volumes = np.where(
+            accumulating,
+            2000000 + rng.normal(0, 300000, 50),
+            1000000 + rng.normal(0, 200000, 50)
+        )
+        range_mult = np.where(accumulating, 0.3, 1.0)
+        
+        base_prices = 100.0 * np.cumprod(1 + price_changes)
+        range_size = base_prices * 0.03 * range_mult
+        
+        return pd.DataFrame({
+            'symbol': 'ACCUM',
+            'date': _DATES_50,
+            'open': base_prices,
+            'high': base_prices + range_size,
+            'low': base_prices - range_size,
+            'close': base_prices,
+            'volume': np.maximum(volumes.astype(np.int64), 100000),
+            'sector': 'Technology'
+        })
     
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def normal_stock_data(self):
         """Create stock with normal trading pattern"""
-        np.random.seed(123)
-        dates = pd.date_range('2024-01-01', periods=50)
-        
-        data = []
-        base_price = 100.0
-        
-        for date in dates:
-            # Consistent normal trading
-            price_change = np.random.normal(0, 0.02)
-            base_price *= (1 + price_change)
-            
-            range_size = base_price * 0.03
-            high = base_price + range_size
-            low = base_price - range_size
-            volume = 1000000 + np.random.normal(0, 300000)
-            
-            data.append({
-                'symbol': 'NORMAL',
-                'date': date,
-                'open': base_price,
-                'high': high,
-                'low': low,
-                'close': base_price,
-                'volume': max(int(volume), 100000),
-                'sector': 'Technology'
-            })
-        
-        return pd.DataFrame(data)
+        rng = np.random.default_rng(123)
+        
+        # Consistent normal trading
+        base_prices = 100.0 * np.cumprod(1 + rng.normal(0, 0.02, 50))
+        range_size = base_prices * 0.03
+        volumes = 1000000 + rng.normal(0, 300000, 50)
+        
+        return pd.DataFrame({
+            'symbol': 'NORMAL',
+            'date': _DATES_50,
+            'open': base_prices,
+            'high': base_prices + range_size,
+            'low': base_prices - range_size,
+            'close': base_prices,
+            'volume': np.maximum(volumes.astype(np.int64), 100000),
+            'sector': 'Technology'
+        })
     
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def outperforming_sector_data(self):
         """Create sector data that underperforms stocks"""
-        dates = pd.date_range('2024-01-01', periods=50)
-        
-        data = []
-        sector_price = 200.0
-        
-        for date in dates:
-            # Sector declines slightly
-            sector_price *= (1 + np.random.normal(-0.001, 0.01))
-            
-            data.append({
-                'date': date,
-                'sector': 'Technology',
-                'sector_close': sector_price
-            })
-        
-        return pd.DataFrame(data)
+        rng = np.random.default_rng(7)
+        
+        # Sector declines slightly
+        return pd.DataFrame({
+            'date': _DATES_50,
+            'sector': 'Technology',
+            'sector_close': 200.0 * np.cumprod(1 + rng.normal(-0.001, 0.01, 50))
+        })
+    
+    @pytest.fixture(scope="module")
+    def accum_features(self, accumulation_stock_data):
+        """Features for the accumulation stock, computed once"""
+        return FeatureComputer.compute_all(accumulation_stock_data)
+    
+    @pytest.fixture(scope="module")
+    def normal_features(self, normal_stock_data):
+        """Features for the normal stock, computed once"""
+        return FeatureComputer.compute_all(normal_stock_data)
     
-    def test_accumulation_vs_normal_detection(self, accumulation_stock_data, normal_stock_data, outperforming_sector_data):
+    @pytest.fixture(scope="module")
+    def agent_results(self, accum_features, normal_features, outperforming_sector_data):
+        """AccumulationAgent results for both stocks, with and without the sector, run once"""
+        return {
+            'accum': AccumulationAgent.run(accum_features, outperforming_sector_data),
+            'normal': AccumulationAgent.run(normal_features, outperforming_sector_data),
+            'accum_nosector': AccumulationAgent.run(accum_features),
+            'normal_nosector': AccumulationAgent.run(normal_features)
+        }
+    
+    def test_accumulation_vs_normal_detection(self, agent_results):
         """Test that accumulation pattern scores higher than normal pattern"""
-        # Compute features for both stocks
-        accum_features = FeatureComputer.compute_all(accumulation_stock_data)
-        normal_features = FeatureComputer.compute_all(normal_stock_data)
-        
-        # Run accumulation analysis
-        accum_result = AccumulationAgent.run(accum_features, outperforming_sector_data)
-        normal_result = AccumulationAgent.run(normal_features, outperforming_sector_data)
-        
         # Accumulation pattern should score higher
-        assert accum_result['accumulation_score'] > normal_result['accumulation_score']
+        assert agent_results['accum']['accumulation_score'] > agent_results['normal']['accumulation_score']
     
-    def test_evidence_flags_in_accumulation(self, accumulation_stock_data, outperforming_sector_data):
+    def test_evidence_flags_in_accumulation(self, agent_results):
         """Test that accumulation pattern triggers evidence flags"""
-        features = FeatureComputer.compute_all(accumulation_stock_data)
-        result = AccumulationAgent.run(features, outperforming_sector_data)
+        evidence = agent_results['accum']['evidence']
         
-        evidence = result['evidence']
-        
-        # Should detect some accumulation evidence
-        evidence_count = sum([
+        # Should detect some accumulation evidence: at least one flag active
+        assert any((
             evidence.volume_absorption,
             evidence.volatility_compression,
             evidence.tight_base,
             evidence.relative_strength
-        ])
-        
-        assert evidence_count > 0  # At least one flag should be active
+        ))
     
-    def test_volume_absorption_in_realistic_scenario(self, accumulation_stock_data):
+    def test_volume_absorption_in_realistic_scenario(self, agent_results):
         """Test volume absorption detection with realistic data"""
-        features = FeatureComputer.compute_all(accumulation_stock_data)
-        result = AccumulationAgent.run(features)
-        
         # Check volume metrics
-        volume_ratio = result['metrics']['volume_ratio']
+        volume_ratio = agent_results['accum_nosector']['metrics']['volume_ratio']
         
         # Should calculate a valid volume ratio
         assert volume_ratio > 0  # Valid ratio calculated
     
-    def test_volatility_compression_detection(self, accumulation_stock_data):
+    def test_volatility_compression_detection(self, agent_results):
         """Test volatility compression with computed ATR"""
-        features = FeatureComputer.compute_all(accumulation_stock_data)
-        result = AccumulationAgent.run(features)
-        
         # Should detect some level of compression
-        compression_ratio = result['metrics']['compression_ratio']
+        compression_ratio = agent_results['accum_nosector']['metrics']['compression_ratio']
         assert compression_ratio > 0  # Valid compression ratio calculated
     
-    def test_relative_strength_calculation(self, accumulation_stock_data, outperforming_sector_data):
+    def test_relative_strength_calculation(self, agent_results):
         """Test relative strength with real performance data"""
-        features = FeatureComputer.compute_all(accumulation_stock_data)
-        result = AccumulationAgent.run(features, outperforming_sector_data)
-        
         # Should show positive relative performance
-        rel_perf = result['metrics']['relative_performance']
+        rel_perf = agent_results['accum']['metrics']['relative_performance']
         assert rel_perf != 0.0  # Should calculate actual relative performance
     
-    def test_score_consistency(self, accumulation_stock_data, outperforming_sector_data):
+    def test_score_consistency(self, agent_results):
         """Test that same data produces consistent scores"""
-        features = FeatureComputer.compute_all(accumulation_stock_data)
-        
-        result1 = AccumulationAgent.run(features, outperforming_sector_data)
-        result2 = AccumulationAgent.run(features, outperforming_sector_data)
-        
-        # Should be deterministic
-        assert result1['accumulation_score'] == result2['accumulation_score']
-        assert result1['evidence'].volume_absorption == result2['evidence'].volume_absorption
+        result = agent_results['accum']
+        
+        # Deterministic: the seeded fixtures always score the same
+        assert result['accumulation_score'] == EXPECTED_ACCUM_SCORE
+        assert (
+            result['evidence'].volume_absorption,
+            result['evidence'].volatility_compression,
+            result['evidence'].tight_base,
+            result['evidence'].relative_strength
+        ) == EXPECTED_ACCUM_EVIDENCE
     
-    def test_score_bounds(self, accumulation_stock_data, normal_stock_data):
+    def test_score_bounds(self, agent_results):
         """Test that scores stay within 0-100 bounds"""
-        accum_features = FeatureComputer.compute_all(accumulation_stock_data)
-        normal_features = FeatureComputer.compute_all(normal_stock_data)
-        
-        accum_result = AccumulationAgent.run(accum_features)
-        normal_result = AccumulationAgent.run(normal_features)
-        
         # Check bounds
-        assert 0 <= accum_result['accumulation_score'] <= 100
-        assert 0 <= normal_result['accumulation_score'] <= 100
+        for result in agent_results.values():
+            assert 0 <= result['accumulation_score'] <= 100
     
-    def test_pipeline_integration(self, accumulation_stock_data, outperforming_sector_data):
+    def test_pipeline_integration(self, agent_results):
         """Test full pipeline from raw data to accumulation score"""
-        # Complete pipeline: raw data -> features -> accumulation analysis
-        features = FeatureComputer.compute_all(accumulation_stock_data)
-        result = AccumulationAgent.run(features, outperforming_sector_data)
+        # Complete pipeline: raw data -> features (fixtures) -> accumulation analysis
+        result = agent_results['accum']
         
         # Validate complete result structure
         assert isinstance(result['accumulation_score'], int)
@@ -198,4 +168,5 @@ class TestAccumulationIntegration:
         # Validate metrics
         metrics = result['metrics']
         assert all(isinstance(v, (int, float)) for v in metrics.values())
-        assert all(not np.isnan(v) for v in metrics.values() if v != 0.0)
\ No newline at end of file
+        values = np.fromiter(metrics.values(), dtype=float, count=len(metrics))
+        assert not np.isnan(values).any()
\ No newline at end of file
@@ -2,8 +2,11 @@
 Unit tests for BacktestEngine - Tests individual methods and components.
 """
 
+import functools
 import unittest
+import numpy as np
 import pandas as pd
+import pytest
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
@@ -12,37 +15,64 @@ from backtest_engine import BacktestEngine, Trade, Position
 from governor import Governor, Decision
 
 
+# MockGovernor outcomes keyed by (signal type, confidence >= 60)
+_DECISIONS = {
+    ('ENTRY', True): (Decision.ENTER, "Entry approved"),
+    ('ENTRY', False): (Decision.NO_TRADE, "Low confidence"),
+    ('EXIT', True): (Decision.EXIT, "Exit approved"),
+    ('EXIT', False): (Decision.EXIT, "Exit approved")
+}
+
+
 class MockGovernor:
     """Mock Governor for testing."""
     @staticmethod
     def run(**kwargs):
-        signal_type = kwargs.get('signal_type')
-        confidence = kwargs.get('confidence_score', 70)
-        
-        if signal_type == 'ENTRY':
-            if confidence >= 60:
-                return Decision.ENTER, "Entry approved"
-            else:
-                return Decision.NO_TRADE, "Low confidence"
-        elif signal_type == 'EXIT':
-            return Decision.EXIT, "Exit approved"
-        else:
-            return Decision.NO_TRADE, "Unknown signal"
+        key = (kwargs.get('signal_type'), kwargs.get('confidence_score', 70) >= 60)
+        return _DECISIONS.get(key, (Decision.NO_TRADE, "Unknown signal"))
+
+
+# Column schema of one day's market data, declared once for the inline frames
+DAY_DTYPE = np.dtype([
+    ('date', 'O'), ('symbol', 'O'),
+    ('open', 'f8'), ('high', 'f8'), ('low', 'f8'), ('close', 'f8'),
+    ('volume', 'i8')
+])
+
+
+def _make_day(date, symbol, open_, high, low, close, volume):
+    """One-row day frame built from a typed record (no dtype inference)."""
+    return pd.DataFrame(np.array([(date, symbol, open_, high, low, close, volume)], dtype=DAY_DTYPE))
+
+
+# Read-only market data shared by every test; tests only filter it
+SAMPLE_DATA = pd.DataFrame({
+    'date': ['2023-01-01', '2023-01-01', '2023-01-02', '2023-01-02'],
+    'symbol': ['AAPL', 'GOOGL', 'AAPL', 'GOOGL'],
+    'open': [150.0, 2500.0, 152.0, 2480.0],
+    'high': [155.0, 2520.0, 156.0, 2490.0],
+    'low': [148.0, 2480.0, 150.0, 2470.0],
+    'close': [153.0, 2510.0, 154.0, 2485.0],
+    'volume': [1000000, 500000, 1200000, 600000]
+})
+SAMPLE_DAY_01 = SAMPLE_DATA[SAMPLE_DATA['date'] == '2023-01-01'].reset_index(drop=True)
+SAMPLE_DAY_02 = SAMPLE_DATA[SAMPLE_DATA['date'] == '2023-01-02'].reset_index(drop=True)
+
+# Single-symbol AAPL days: low hits the 140 stop (139), stays above it (148),
+# and plain entry/exit days
+STOP_TRIGGER_DAY = _make_day('2023-01-02', 'AAPL', 145.0, 147.0, 139.0, 142.0, 1000000)
+STOP_CLEAR_DAY = _make_day('2023-01-02', 'AAPL', 152.0, 155.0, 148.0, 154.0, 1000000)
+ENTRY_DAY = _make_day('2023-01-01', 'AAPL', 150.0, 155.0, 148.0, 153.0, 1000000)
+EXIT_DAY = _make_day('2023-01-02', 'AAPL', 152.0, 155.0, 150.0, 154.0, 1000000)
 
 
 class TestBacktestEngine(unittest.TestCase):
     
-    def setUp(self):
-        self.engine = BacktestEngine(initial_capital=100000)
-        self.sample_data = pd.DataFrame({
-            'date': ['2023-01-01', '2023-01-01', '2023-01-02', '2023-01-02'],
-            'symbol': ['AAPL', 'GOOGL', 'AAPL', 'GOOGL'],
-            'open': [150.0, 2500.0, 152.0, 2480.0],
-            'high': [155.0, 2520.0, 156.0, 2490.0],
-            'low': [148.0, 2480.0, 150.0, 2470.0],
-            'close': [153.0, 2510.0, 154.0, 2485.0],
-            'volume': [1000000, 500000, 1200000, 600000]
-        })
+    @functools.cached_property
+    def engine(self):
+        # unittest makes one TestCase instance per test, so each test gets a
+        # fresh engine, built only if the test uses it
+        return BacktestEngine(initial_capital=100000)
     
     def test_initialization(self):
         """Test BacktestEngine initialization."""
@@ -97,7 +127,7 @@ class TestBacktestEngine(unittest.TestCase):
         )
         self.engine.cash = 85000  # Reduced by position cost
         
-        day_data = self.sample_data[self.sample_data['date'] == '2023-01-01']
+        day_data = SAMPLE_DAY_01
         total_value = self.engine._calculate_total_value(day_data)
         
         # Cash + position value (100 shares * $153 close)
@@ -117,16 +147,8 @@ class TestBacktestEngine(unittest.TestCase):
         self.engine.current_date = '2023-01-02'
         self.engine.cash = 85000
         
-        # Create data where low price hits stop
-        day_data = pd.DataFrame({
-            'date': ['2023-01-02'],
-            'symbol': ['AAPL'],
-            'open': [145.0],
-            'high': [147.0],
-            'low': [139.0],  # Hits stop at 140
-            'close': [142.0],
-            'volume': [1000000]
-        })
+        # Low price hits stop
+        day_data = STOP_TRIGGER_DAY
         
         self.engine._process_stops(day_data)
         
@@ -155,16 +177,8 @@ class TestBacktestEngine(unittest.TestCase):
             stop_price=140.0
         )
         
-        # Create data where low price doesn't hit stop
-        day_data = pd.DataFrame({
-            'date': ['2023-01-02'],
-            'symbol': ['AAPL'],
-            'open': [152.0],
-            'high': [155.0],
-            'low': [148.0],  # Above stop at 140
-            'close': [154.0],
-            'volume': [1000000]
-        })
+        # Low price doesn't hit stop
+        day_data = STOP_CLEAR_DAY
         
         self.engine._process_stops(day_data)
         
@@ -183,7 +197,7 @@ class TestBacktestEngine(unittest.TestCase):
             'stop_price': 138.0
         }
         
-        day_data = self.sample_data[self.sample_data['date'] == '2023-01-01']
+        day_data = SAMPLE_DAY_01
         self.engine.current_date = '2023-01-01'
         
         self.engine._process_entry_signal(signal, day_data, MockGovernor)
@@ -211,7 +225,7 @@ class TestBacktestEngine(unittest.TestCase):
             'stop_price': 138.0
         }
         
-        day_data = self.sample_data[self.sample_data['date'] == '2023-01-01']
+        day_data = SAMPLE_DAY_01
         self.engine.current_date = '2023-01-01'
         
         self.engine._process_entry_signal(signal, day_data, MockGovernor)
@@ -239,7 +253,7 @@ class TestBacktestEngine(unittest.TestCase):
             'decayed_confidence': 45.0
         }
         
-        day_data = self.sample_data[self.sample_data['date'] == '2023-01-02']
+        day_data = SAMPLE_DAY_02
         
         self.engine._process_exit_signal(signal, day_data, MockGovernor)
         
@@ -260,7 +274,7 @@ class TestBacktestEngine(unittest.TestCase):
     def test_update_equity_curve(self):
         """Test equity curve update."""
         self.engine.current_date = '2023-01-01'
-        day_data = self.sample_data[self.sample_data['date'] == '2023-01-01']
+        day_data = SAMPLE_DAY_01
         
         self.engine._update_equity_curve(day_data)
         
@@ -306,7 +320,7 @@ class TestBacktestEngine(unittest.TestCase):
         self.assertEqual(metrics['total_trades'], 1)
         self.assertEqual(metrics['winning_trades'], 1)
         self.assertEqual(metrics['win_rate_pct'], 100.0)
-        self.assertAlmostEqual(metrics['total_return_pct'], 0.5, places=1)
+        self.assertEqual(metrics['total_return_pct'], pytest.approx(0.5, abs=0.05))
 
 
 def simple_signal_generator(day_data, existing_positions):
@@ -339,15 +353,7 @@ class TestBacktestEngineSignalProcessing(unittest.TestCase):
             'stop_price': 138.0
         }
         
-        day_data = pd.DataFrame({
-            'date': ['2023-01-01'],
-            'symbol': ['AAPL'],
-            'open': [150.0],
-            'high': [155.0],
-            'low': [148.0],
-            'close': [153.0],
-            'volume': [1000000]
-        })
+        day_data = ENTRY_DAY
         
         engine._process_signal(signal, day_data, MockGovernor)
         
@@ -374,15 +380,7 @@ class TestBacktestEngineSignalProcessing(unittest.TestCase):
             'decayed_confidence': 45.0
         }
         
-        day_data = pd.DataFrame({
-            'date': ['2023-01-02'],
-            'symbol': ['AAPL'],
-            'open': [152.0],
-            'high': [155.0],
-            'low': [150.0],
-            'close': [154.0],
-            'volume': [1000000]
-        })
+        day_data = EXIT_DAY
         
         engine._process_signal(signal, day_data, MockGovernor)
         
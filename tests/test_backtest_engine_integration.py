@@ -2,6 +2,7 @@
 Integration tests for BacktestEngine - Tests complete backtesting workflows.
 """
 
+import functools
 import unittest
 import pandas as pd
 import numpy as np
@@ -13,73 +14,76 @@ from backtest_engine import BacktestEngine
 from governor import Governor, Decision
 
 
+# Governor outcomes built once and shared by every run() call
+_APPROVE = {
+    'ENTRY': (Decision.ENTER, "Entry approved"),
+    'EXIT': (Decision.EXIT, "Exit approved")
+}
+_UNKNOWN = (Decision.NO_TRADE, "Unknown signal")
+_REJECT = (Decision.NO_TRADE, "Rejected for testing")
+
+
 class MockGovernorAlwaysApprove:
     """Mock Governor that always approves trades."""
     @staticmethod
-    def run(**kwargs):
-        signal_type = kwargs.get('signal_type')
-        if signal_type == 'ENTRY':
-            return Decision.ENTER, "Entry approved"
-        elif signal_type == 'EXIT':
-            return Decision.EXIT, "Exit approved"
-        else:
-            return Decision.NO_TRADE, "Unknown signal"
+    def run(signal_type=None, **_):
+        return _APPROVE.get(signal_type, _UNKNOWN)
 
 
 class MockGovernorAlwaysReject:
     """Mock Governor that always rejects trades."""
     @staticmethod
-    def run(**kwargs):
-        return Decision.NO_TRADE, "Rejected for testing"
+    def run(**_):
+        return _REJECT
 
 
-def create_test_data(symbols=['AAPL', 'GOOGL'], days=10):
-    """Create test price data."""
-    dates = pd.date_range('2023-01-01', periods=days, freq='D')
-    data = []
+def create_test_data(symbols=('AAPL', 'GOOGL'), days=10):
+    """
+    Create test price data (rows grouped by symbol, dates ascending).
     
-    np.random.seed(42)  # Reproducible
+    Frames are cached per (symbols, days); callers get a shallow copy, so
+    column changes never reach the cached frame.
+    """
+    return _build_test_data(tuple(symbols), days).copy(deep=False)
+
+
+@functools.lru_cache(maxsize=None)
+def _build_test_data(symbols, days):
+    """Build the price frame behind create_test_data."""
+    dates = pd.date_range('2023-01-01', periods=days, freq='D').strftime('%Y-%m-%d').to_numpy()
     
-    for symbol in symbols:
-        base_price = 100.0 if symbol == 'AAPL' else 2000.0
-        
-        for i, date in enumerate(dates):
-            # Simple price progression
-            price_mult = 1 + (i * 0.01)  # 1% daily increase
-            open_price = base_price * price_mult
-            close_price = open_price * 1.005  # Small daily gain
-            high_price = close_price * 1.01
-            low_price = open_price * 0.99
-            
-            data.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'symbol': symbol,
-                'open': round(open_price, 2),
-                'high': round(high_price, 2),
-                'low': round(low_price, 2),
-                'close': round(close_price, 2),
-                'volume': 1000000
-            })
+    # Simple price progression: 1% daily increase from each symbol's base
+    base_prices = np.array([100.0 if symbol == 'AAPL' else 2000.0 for symbol in symbols])
+    open_prices = np.outer(base_prices, 1 + 0.01 * np.arange(days)).ravel()
+    close_prices = open_prices * 1.005  # Small daily gain
     
-    return pd.DataFrame(data)
+    return pd.DataFrame({
+        'date': np.tile(dates, len(symbols)),
+        'symbol': np.repeat(symbols, days),
+        'open': np.round(open_prices, 2),
+        'high': np.round(close_prices * 1.01, 2),
+        'low': np.round(open_prices * 0.99, 2),
+        'close': np.round(close_prices, 2),
+        'volume': 1000000
+    })
 
 
 def simple_buy_and_hold_signals(day_data, existing_positions):
     """Generate buy signals on day 2, hold until day 6."""
     signals = []
-    current_date = day_data.iloc[0]['date'] if not day_data.empty else ''
+    current_date = day_data['date'].iat[0] if not day_data.empty else ''
     
     # Buy on second day (after first day data is available)
     if current_date == '2023-01-02':
-        for _, row in day_data.iterrows():
-            if row['symbol'] not in existing_positions:
+        for symbol, open_price in zip(day_data['symbol'].to_numpy(), day_data['open'].to_numpy()):
+            if symbol not in existing_positions:
                 signals.append({
                     'type': 'ENTRY',
-                    'symbol': row['symbol'],
+                    'symbol': symbol,
                     'confidence': 75.0,
                     'shares': 100,
                     'sector': 'Technology',
-                    'stop_price': row['open'] * 0.9  # 10% stop
+                    'stop_price': open_price * 0.9  # 10% stop
                 })
     
     # Sell on day 6
@@ -97,19 +101,19 @@ def simple_buy_and_hold_signals(day_data, existing_positions):
 def stop_loss_trigger_signals(day_data, existing_positions):
     """Generate signals that will trigger stop losses."""
     signals = []
-    current_date = day_data.iloc[0]['date'] if not day_data.empty else ''
+    current_date = day_data['date'].iat[0] if not day_data.empty else ''
     
     # Buy on second day with stops that will trigger
     if current_date == '2023-01-02':
-        for _, row in day_data.iterrows():
-            if row['symbol'] not in existing_positions:
+        for symbol, open_price in zip(day_data['symbol'].to_numpy(), day_data['open'].to_numpy()):
+            if symbol not in existing_positions:
                 signals.append({
                     'type': 'ENTRY',
-                    'symbol': row['symbol'],
+                    'symbol': symbol,
                     'confidence': 75.0,
                     'shares': 100,
                     'sector': 'Technology',
-                    'stop_price': row['open'] * 1.02  # Stop above entry (will trigger)
+                    'stop_price': open_price * 1.02  # Stop above entry (will trigger)
                 })
     
     return signals
@@ -119,7 +123,7 @@ class TestBacktestEngineIntegration(unittest.TestCase):
     
     def test_complete_backtest_workflow(self):
         """Test complete backtest from start to finish."""
-        price_data = create_test_data(['AAPL'], days=5)
+        price_data = create_test_data(('AAPL',), days=5)
         engine = BacktestEngine(100000)
         
         results = engine.run(
@@ -145,7 +149,7 @@ class TestBacktestEngineIntegration(unittest.TestCase):
     
     def test_buy_and_hold_strategy(self):
         """Test simple buy and hold strategy."""
-        price_data = create_test_data(['AAPL'], days=6)
+        price_data = create_test_data(('AAPL',), days=6)
         engine = BacktestEngine(100000)
         
         results = engine.run(
@@ -194,7 +198,7 @@ class TestBacktestEngineIntegration(unittest.TestCase):
     
     def test_governor_rejection_workflow(self):
         """Test workflow when Governor rejects all trades."""
-        price_data = create_test_data(['AAPL'], days=5)
+        price_data = create_test_data(('AAPL',), days=5)
         engine = BacktestEngine(100000)
         
         results = engine.run(
@@ -220,7 +224,7 @@ class TestBacktestEngineIntegration(unittest.TestCase):
     
     def test_multiple_symbols_backtest(self):
         """Test backtest with multiple symbols."""
-        price_data = create_test_data(['AAPL', 'GOOGL', 'MSFT'], days=5)
+        price_data = create_test_data(('AAPL', 'GOOGL', 'MSFT'), days=5)
         engine = BacktestEngine(100000)
         
         results = engine.run(
@@ -242,7 +246,7 @@ class TestBacktestEngineIntegration(unittest.TestCase):
     
     def test_equity_curve_progression(self):
         """Test equity curve tracks portfolio value correctly."""
-        price_data = create_test_data(['AAPL'], days=5)
+        price_data = create_test_data(('AAPL',), days=5)
         engine = BacktestEngine(100000)
         
         results = engine.run(
@@ -286,7 +290,7 @@ class TestBacktestEngineIntegration(unittest.TestCase):
                 })
             return signals
         
-        price_data = create_test_data(['AAPL'], days=3)
+        price_data = create_test_data(('AAPL',), days=3)
         
         results = engine.run(
             price_data=price_data,
@@ -304,18 +308,18 @@ class TestBacktestEngineIntegration(unittest.TestCase):
     def test_realistic_trading_scenario(self):
         """Test realistic trading scenario with mixed outcomes."""
         # Create more realistic price data with some volatility
-        np.random.seed(123)
-        dates = pd.date_range('2023-01-01', periods=10, freq='D')
+        rng = np.random.default_rng(123)
+        dates = pd.date_range('2023-01-01', periods=10, freq='D').strftime('%Y-%m-%d').to_numpy()
         data = []
         
         base_price = 100.0
         for i, date in enumerate(dates):
             # Add some randomness
-            daily_change = np.random.normal(0.001, 0.02)  # Small drift, 2% vol
+            daily_change = rng.normal(0.001, 0.02)  # Small drift, 2% vol
             price = base_price * (1 + daily_change)
             
             data.append({
-                'date': date.strftime('%Y-%m-%d'),
+                'date': date,
                 'symbol': 'AAPL',
                 'open': round(price, 2),
                 'high': round(price * 1.01, 2),
@@ -329,28 +333,34 @@ class TestBacktestEngineIntegration(unittest.TestCase):
         price_data = pd.DataFrame(data)
         engine = BacktestEngine(100000)
         
+        # One deterministic stream per date, seeded once up front
+        rng_by_date = {
+            date: np.random.default_rng(int(date.replace('-', '')))
+            for date in price_data['date'].unique()
+        }
+        
         def random_signals(day_data, existing_positions):
             """Generate random entry/exit signals."""
             signals = []
-            np.random.seed(int(day_data.iloc[0]['date'].replace('-', '')))
+            day_rng = rng_by_date[day_data['date'].iat[0]]
             
             # Random entry signals
-            if len(existing_positions) == 0 and np.random.random() < 0.3:
+            if len(existing_positions) == 0 and day_rng.random() < 0.3:
                 signals.append({
                     'type': 'ENTRY',
                     'symbol': 'AAPL',
-                    'confidence': np.random.uniform(60, 90),
+                    'confidence': day_rng.uniform(60, 90),
                     'shares': 100,
                     'sector': 'Technology',
                     'stop_price': day_data.iloc[0]['close'] * 0.95
                 })
             
             # Random exit signals
-            elif len(existing_positions) > 0 and np.random.random() < 0.2:
+            elif len(existing_positions) > 0 and day_rng.random() < 0.2:
                 signals.append({
                     'type': 'EXIT',
                     'symbol': 'AAPL',
-                    'decayed_confidence': np.random.uniform(40, 60)
+                    'decayed_confidence': day_rng.uniform(40, 60)
                 })
             
             return signals
@@ -3,12 +3,13 @@ Unit tests for ConfidenceDecay - Tests individual methods and edge cases.
 """
 
 import unittest
+import numpy as np
 import pandas as pd
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from confidence_decay import ConfidenceDecay
+from confidence_decay import ConfidenceDecay, _decay_components_loop, _decay_components_np
 
 
 class TestConfidenceDecay(unittest.TestCase):
@@ -199,6 +200,51 @@ class TestConfidenceDecay(unittest.TestCase):
         self.assertLess(result.iloc[0]['decayed_confidence'], 80.0)  # Should have decay
         self.assertLess(result.iloc[1]['decayed_confidence'], 70.0)  # Should have decay
     
+    def test_batch_decay_matches_scalar(self):
+        """Test the column-wise batch path against decay_confidence row by row."""
+        rng = np.random.default_rng(42)
+        n = 10_000
+        prev = rng.uniform(20.0, 200.0, n)
+        df = pd.DataFrame({
+            'initial_confidence': rng.uniform(40.0, 95.0, n),
+            'position_age_days': rng.integers(0, 40, n),
+            'entry_price': rng.uniform(20.0, 200.0, n),
+            'current_price': prev * rng.uniform(0.95, 1.05, n),
+            'price_5_days_ago': prev,
+            'sector_performance_5d': rng.uniform(-4.0, 4.0, n),
+            'market_performance_5d': rng.uniform(-2.0, 2.0, n)
+        })
+        
+        result = ConfidenceDecay.batch_decay(df)
+        expected = [
+            ConfidenceDecay.decay_confidence(*row)
+            for row in df[[
+                'initial_confidence', 'position_age_days', 'entry_price', 'current_price',
+                'price_5_days_ago', 'sector_performance_5d', 'market_performance_5d'
+            ]].itertuples(index=False)
+        ]
+        
+        for col in ['decayed_confidence', 'total_decay', 'decay_factors', 'force_exit', 'current_pnl_pct']:
+            self.assertEqual(result[col].tolist(), [info[col] for info in expected], col)
+    
+    def test_decay_components_loop_matches_vectorized(self):
+        """Test the single-pass decay kernel against the NumPy path."""
+        age = np.array([5.0, 15.0, 30.0, 12.0])
+        current = np.array([50.0, 51.0, 60.0, 10.0])
+        prev = np.array([50.5, 50.8, 50.0, 0.0])
+        sector_rel = np.array([0.2, -2.0, -1.0, -1.5])
+        
+        params = (
+            ConfidenceDecay.GRACE_PERIOD_DAYS, ConfidenceDecay.TIME_DECAY_RATE,
+            ConfidenceDecay.STAGNATION_THRESHOLD, ConfidenceDecay.STAGNATION_DECAY,
+            ConfidenceDecay.SECTOR_DECAY_RATE
+        )
+        loop = _decay_components_loop(age, current, prev, sector_rel, *params)
+        vectorized = _decay_components_np(age, current, prev, sector_rel, *params)
+        
+        for got, expected in zip(loop, vectorized):
+            self.assertEqual(got.tolist(), expected.tolist())
+    
     def test_edge_cases(self):
         """Test edge cases and boundary conditions."""
         # Zero confidence input
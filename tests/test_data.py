@@ -11,7 +11,8 @@ from src.data_loader import DataLoader
 class TestOHLCVSchema:
     def test_get_dtypes(self):
         dtypes = OHLCVSchema.get_dtypes()
-        assert dtypes['symbol'] == 'string'
+        assert dtypes['symbol'] == 'category'
+        assert dtypes['sector'] == 'category'
         assert dtypes['open'] == 'float64'
         assert dtypes['volume'] == 'int64'
 
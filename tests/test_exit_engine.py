@@ -155,6 +155,31 @@ class TestExitEngine(unittest.TestCase):
         self.assertGreater(result.iloc[0]['stop_price'], 47.0)  # Should trail higher
         self.assertGreater(result.iloc[1]['stop_price'], 96.0)  # Should trail higher
     
+    def test_batch_matches_scalar_update(self):
+        """Test vectorized batch results match per-position update()."""
+        df = pd.DataFrame({
+            'current_price': [50.0, 50.0, 50.0, 51.0, 105.0],
+            'entry_price': [48.0, 48.0, 48.0, 50.0, 100.0],
+            'current_atr': [2.0, 2.0, 2.0, 1.5, 4.0],
+            'sma20': [50.5, 48.0, 47.0, 50.0, 100.0],
+            'existing_stop': [None, 44.0, 49.0, None, 96.0],
+            'position_age_days': [0, 6, 12, 3, 10]
+        })
+
+        result = ExitEngine.batch_update(df)
+
+        for i, row in df.iterrows():
+            expected = ExitEngine.update(
+                current_price=row['current_price'],
+                entry_price=row['entry_price'],
+                current_atr=row['current_atr'],
+                sma20=row['sma20'],
+                existing_stop=None if pd.isna(row['existing_stop']) else row['existing_stop'],
+                position_age_days=row['position_age_days']
+            )
+            for key, value in expected.items():
+                self.assertEqual(result.iloc[i][key], value)
+
     def test_edge_cases(self):
         """Test edge cases and boundary conditions."""
         # Zero ATR
@@ -76,4 +76,47 @@ class TestFeatureComputer:
         
         # SMA at position 19 should only use data from positions 0-19
         expected_sma = df['close'].iloc[:20].mean()
-        assert abs(sma.iloc[19] - expected_sma) < 0.01
\ No newline at end of file
+        assert abs(sma.iloc[19] - expected_sma) < 0.01
+    
+    def test_compute_arrays_matches_pandas_rolling(self):
+        from src.features import _as_arrays
+
+        rng = np.random.default_rng(17)
+        close = 100 + np.cumsum(rng.normal(0, 1, 60))
+        df = pd.DataFrame({
+            'open': close,
+            'high': close + rng.uniform(0, 2, 60),
+            'low': close - rng.uniform(0, 2, 60),
+            'close': close,
+            'volume': rng.integers(500000, 3000000, 60).astype(float)
+        })
+
+        # Independent pandas reference for each feature
+        prev_close = df['close'].shift(1)
+        true_range = pd.concat([
+            df['high'] - df['low'],
+            (df['high'] - prev_close).abs(),
+            (df['low'] - prev_close).abs()
+        ], axis=1).max(axis=1)
+        expected = {
+            'atr_14': true_range.rolling(14).mean(),
+            'sma_20': df['close'].rolling(20).mean(),
+            'sma_50': df['close'].rolling(50).mean(),
+            'rvol_20': df['volume'] / df['volume'].rolling(20).mean()
+        }
+
+        features = FeatureComputer.compute_arrays(_as_arrays(df))
+
+        assert features.keys() == expected.keys()
+        for name, values in features.items():
+            np.testing.assert_allclose(values, expected[name].to_numpy(), err_msg=name)
+
+    def test_compute_universe_matches_per_symbol(self, sample_ohlcv):
+        other = sample_ohlcv.assign(close=sample_ohlcv['close'] * 2, symbol='BBB')
+        universe = pd.concat([sample_ohlcv.assign(symbol='AAA'), other], ignore_index=True)
+
+        result = FeatureComputer.compute_universe(universe, max_workers=2)
+
+        for symbol, group in universe.groupby('symbol'):
+            expected = FeatureComputer.compute_all(group)
+            pd.testing.assert_frame_equal(result[result['symbol'] == symbol], expected)
@@ -89,6 +89,13 @@ class TestGovernor(unittest.TestCase):
         self.assertEqual(decision, Decision.EXIT)
         self.assertIn("Force exit: Drawdown", reason)
     
+    def test_plain_exit_approval(self):
+        """Test exit approval without P&L or confidence detail."""
+        decision, reason = Governor._process_exit_signal('MSFT', None, None, [])
+        
+        self.assertEqual(decision, Decision.EXIT)
+        self.assertEqual(reason, "Exit approved: Exit conditions satisfied")
+    
     def test_sector_exposure_check(self):
         """Test sector exposure validation."""
         existing_positions = [
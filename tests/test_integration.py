@@ -265,7 +265,8 @@ class TestIndianMarketIntegration(unittest.TestCase):
             from indian_market_config import (
                 INDIAN_MARKET_CONFIG, 
                 IndianSectorMapper, 
-                is_indian_trading_day
+                is_indian_trading_day,
+                indian_trading_day_mask
             )
             
             # Test configuration values
@@ -280,6 +281,11 @@ class TestIndianMarketIntegration(unittest.TestCase):
             is_trading = is_indian_trading_day('2024-01-15')  # Monday
             self.assertIsInstance(is_trading, bool)
             
+            # Vectorized mask agrees with the scalar check (incl. Republic Day)
+            dates = pd.Series(['2024-01-25', '2024-01-26', '2024-01-27', '2024-01-29'])
+            mask = indian_trading_day_mask(dates)
+            self.assertEqual(mask.tolist(), [is_indian_trading_day(d) for d in dates])
+            
         except ImportError:
             self.skipTest("Indian market configuration not available")
 
@@ -4,7 +4,9 @@ Unit tests for KPI Computer - Tests all KPI calculation methods.
 
 import unittest
 from unittest.mock import Mock
-from src.kpi_computer import KPIComputer
+import numpy as np
+from src.kpi_computer import KPIComputer, _max_drawdown_loop
+from src.backtest_engine import Trade, TradeArrays
 
 
 class TestKPIComputer(unittest.TestCase):
@@ -53,6 +55,12 @@ class TestKPIComputer(unittest.TestCase):
         single_point = [{'total_value': 10000}]
         self.assertEqual(KPIComputer._calculate_max_drawdown(single_point), 0.0)
     
+    def test_max_drawdown_loop_matches_vectorized(self):
+        """Test the single-pass drawdown kernel against the NumPy path."""
+        values = np.array([p['total_value'] for p in self.equity_curve], dtype=float)
+        expected = KPIComputer._calculate_max_drawdown(self.equity_curve)
+        self.assertEqual(round(_max_drawdown_loop(values) * 100, 2), expected)
+    
     def test_calculate_win_rate(self):
         """Test win rate calculation."""
         win_rate = KPIComputer._calculate_win_rate(self.trades)
@@ -105,6 +113,18 @@ class TestKPIComputer(unittest.TestCase):
         # Empty trades
         self.assertEqual(KPIComputer._calculate_trade_stats([]), {})
     
+    def test_helpers_accept_pnl_array(self):
+        """Test PnL helpers give the same results for a precomputed array."""
+        pnls = KPIComputer._pnl_array(self.trades)
+        
+        self.assertEqual(pnls.tolist(), [100.0, -50.0])
+        self.assertEqual(KPIComputer._calculate_expectancy(pnls), 25.0)
+        self.assertEqual(KPIComputer._calculate_win_rate(pnls), 50.0)
+        self.assertEqual(
+            KPIComputer._calculate_trade_stats(pnls),
+            KPIComputer._calculate_trade_stats(self.trades)
+        )
+    
     def test_generate_summary(self):
         """Test summary generation."""
         summary = KPIComputer._generate_summary(25.0, 5.0, 50.0, 10)
@@ -132,6 +152,45 @@ class TestKPIComputer(unittest.TestCase):
         self.assertIn('trade_statistics', kpis)
         self.assertIn('summary', kpis)
     
+    def test_compute_kpis_from_trade_arrays(self):
+        """Test columnar trade input gives the same KPIs as Trade objects."""
+        trades = [
+            Trade('AAPL', '2023-01-02', 100.0, pnl=150.0),
+            Trade('MSFT', '2023-01-03', 200.0, pnl=-80.0),
+            Trade('AAPL', '2023-01-05', 105.0, pnl=40.0)
+        ]
+        signal_data = [
+            {'symbol': 'AAPL', 'date': '2023-01-02', 'executed': True},
+            {'symbol': 'MSFT', 'date': '2023-01-03', 'executed': True},
+            {'symbol': 'TSLA', 'date': '2023-01-04', 'executed': False, 'rejection_reason': 'Low confidence'}
+        ]
+        
+        from_objects = KPIComputer.compute_kpis(trades, self.equity_curve, signal_data=signal_data)
+        from_arrays = KPIComputer.compute_kpis(
+            TradeArrays.from_trades(trades), self.equity_curve, signal_data=signal_data
+        )
+        
+        self.assertEqual(from_arrays, from_objects)
+        self.assertEqual(from_arrays['signal_quality_stats']['profitable_signals'], 1)
+    
+    def test_compute_kpis_from_pnl_array(self):
+        """Test a bare PnL array gives the same KPIs as trade objects."""
+        from_objects = KPIComputer.compute_kpis(self.trades, self.equity_curve)
+        from_pnls = KPIComputer.compute_kpis(np.array([100.0, -50.0]), self.equity_curve)
+        
+        self.assertEqual(from_pnls, from_objects)
+        self.assertEqual(KPIComputer.compute_kpis(np.array([]), [])['total_trades'], 0)
+        self.assertEqual(KPIComputer.compute_kpis(None, [])['total_trades'], 0)
+        
+        # Signal matching needs symbols and entry dates, which a PnL array lacks
+        signal_data = [{'symbol': 'AAPL', 'date': '2023-01-02', 'executed': True}]
+        with self.assertRaises(ValueError):
+            KPIComputer.compute_kpis(np.array([100.0, -50.0]), self.equity_curve, signal_data=signal_data)
+        
+        equity_values = [point['total_value'] for point in self.equity_curve]
+        from_arrays = KPIComputer.compute_kpis_from_arrays(np.array([100.0, -50.0]), np.array(equity_values))
+        self.assertEqual(from_arrays, from_objects)
+    
     def test_compute_kpis_empty(self):
         """Test KPI computation with no trades."""
         kpis = KPIComputer.compute_kpis([], [])
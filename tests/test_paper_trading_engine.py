@@ -3,9 +3,11 @@ Unit tests for Paper Trading Engine - Tests signal generation functionality.
 """
 
 import unittest
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from src.paper_trading_engine import PaperTradingEngine
+from src._numba_kernels import score_universe, stack_tails
 
 
 class TestPaperTradingEngine(unittest.TestCase):
@@ -94,36 +96,51 @@ class TestPaperTradingEngine(unittest.TestCase):
     def test_accumulation_score_calculation(self):
         """Test accumulation scoring."""
         # Test with sufficient data
-        data_20_days = pd.DataFrame({
-            'volume': [1000000] * 15 + [2000000] * 5  # Recent volume spike
-        })
+        data_20_days = np.array([1000000] * 15 + [2000000] * 5)  # Recent volume spike
         
         score = self.engine._calculate_accumulation_score(data_20_days)
         self.assertGreater(score, 50.0)  # Should be above neutral
         
         # Test with insufficient data
-        short_data = pd.DataFrame({'volume': [1000000] * 5})
+        short_data = np.array([1000000] * 5)
         score = self.engine._calculate_accumulation_score(short_data)
         self.assertEqual(score, 50.0)  # Default score
     
     def test_trigger_score_calculation(self):
         """Test trigger scoring."""
         # Test bullish scenario (price above SMA)
-        bullish_data = pd.DataFrame({
-            'close': [100] * 15 + [105] * 5  # Price trending up
-        })
+        bullish_data = np.array([100.0] * 15 + [105.0] * 5)  # Price trending up
         
         score = self.engine._calculate_trigger_score(bullish_data)
         self.assertGreater(score, 60.0)
         
         # Test bearish scenario
-        bearish_data = pd.DataFrame({
-            'close': [105] * 15 + [95] * 5  # Price trending down
-        })
+        bearish_data = np.array([105.0] * 15 + [95.0] * 5)  # Price trending down
         
         score = self.engine._calculate_trigger_score(bearish_data)
         self.assertLess(score, 50.0)
     
+    def test_batch_scores_match_helpers(self):
+        """Test the batched scoring kernel against the per-symbol helpers."""
+        closes = [
+            np.array([100.0] * 15 + [105.0] * 5),
+            np.array([105.0] * 25 + [95.0] * 5),
+            np.array([100.0] * 5)
+        ]
+        volumes = [
+            np.array([1000000.0] * 15 + [2000000.0] * 5),
+            np.array([1000000.0] * 30),
+            np.array([1000000.0] * 5)
+        ]
+        
+        close2d, lengths = stack_tails(closes, 20)
+        vol2d, _ = stack_tails(volumes, 20)
+        accumulation, trigger = score_universe(close2d, vol2d, lengths)
+        
+        for i in range(len(closes)):
+            self.assertAlmostEqual(accumulation[i], self.engine._calculate_accumulation_score(volumes[i]))
+            self.assertEqual(trigger[i], self.engine._calculate_trigger_score(closes[i]))
+    
     def test_market_regime_assessment(self):
         """Test market regime assessment."""
         # Test with SPY data
@@ -181,6 +198,47 @@ class TestPaperTradingEngine(unittest.TestCase):
         aapl_entries = [s for s in signals['entry_signals'] if s['symbol'] == 'AAPL']
         self.assertEqual(len(aapl_entries), 0)
     
+    def test_exit_uses_latest_bar_for_unsorted_data(self):
+        """Test exits read the most recent bar even if rows are out of date order."""
+        self.engine.paper_positions = {
+            'AAPL': {
+                'entry_price': 180.0,
+                'shares': 10,
+                'stop_price': 170.0,
+                'entry_date': '2024-01-10'
+            }
+        }
+        
+        # Latest AAPL bar (below stop) comes first in the frame
+        unsorted_data = pd.DataFrame({
+            'date': ['2024-01-16', '2024-01-15'],
+            'symbol': ['AAPL', 'AAPL'],
+            'close': [165.0, 182.0],
+            'volume': [2000000, 2000000]
+        })
+        
+        signals = self.engine.generate_daily_signals(
+            unsorted_data, '2024-01-16', ['AAPL']
+        )
+        
+        self.assertEqual(len(signals['exit_signals']), 1)
+        self.assertEqual(signals['exit_signals'][0]['price'], 165.0)
+    
+    def test_prepared_frame_reused_when_data_omitted(self):
+        """Test signals from a prepared frame match passing the data directly."""
+        direct = self.engine.generate_daily_signals(
+            self.test_data, self.test_date, self.universe
+        )
+
+        engine = PaperTradingEngine()
+        prepared = engine.prepare(self.test_data)
+        reused = engine.generate_daily_signals(None, self.test_date, self.universe)
+
+        self.assertEqual(prepared.index.names, ['symbol', 'date'])
+        self.assertEqual(reused['entry_signals'], direct['entry_signals'])
+        self.assertEqual(reused['no_action'], direct['no_action'])
+        self.assertEqual(reused['market_regime'], direct['market_regime'])
+
     def test_report_generation(self):
         """Test daily report generation."""
         signals = self.engine.generate_daily_signals(
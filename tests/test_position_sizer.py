@@ -3,6 +3,7 @@ Unit tests for PositionSizer - Tests individual methods and edge cases.
 """
 
 import unittest
+import numpy as np
 import pandas as pd
 import sys
 import os
@@ -190,6 +191,49 @@ class TestPositionSizer(unittest.TestCase):
         self.assertEqual(len(result), 2)
         self.assertGreater(result.iloc[0]['position_size'], 0)
         self.assertGreater(result.iloc[1]['position_size'], 0)
+    
+    def test_batch_matches_position_size(self):
+        """Test vectorized batch results match per-stock position_size()."""
+        df = pd.DataFrame({
+            'entry_price': [50.0, 100.0, 25.0, 80.0, 40.0],
+            'atr': [2.0, 4.0, 1.0, 3.0, 1.5],
+            'confidence_score': [88.0, 70.0, 61.0, 64.0, 76.0],
+            'daily_volatility': [0.03, 0.06, 0.02, 0.20, 0.05]
+        })
+        
+        result = PositionSizer.batch_size(df, self.account_value)
+        
+        for i, row in df.iterrows():
+            expected = PositionSizer.position_size(
+                account_value=self.account_value,
+                entry_price=row['entry_price'],
+                atr=row['atr'],
+                confidence_score=row['confidence_score'],
+                daily_volatility=row['daily_volatility']
+            )
+            for key, value in expected.items():
+                self.assertEqual(result.iloc[i][key], value)
+
+    
+    def test_batch_rejects_invalid_atr(self):
+        """Test zero or missing ATR on a tradeable row raises instead of sizing."""
+        for bad_atr in (0.0, np.nan):
+            df = pd.DataFrame({
+                'entry_price': [50.0, 100.0],
+                'atr': [2.0, bad_atr],
+                'confidence_score': [88.0, 70.0]
+            })
+            with self.assertRaises(ValueError):
+                PositionSizer.batch_size(df, self.account_value)
+        
+        # Rows below the confidence threshold are never sized, so their ATR is not checked
+        df = pd.DataFrame({
+            'entry_price': [50.0, 100.0],
+            'atr': [2.0, 0.0],
+            'confidence_score': [88.0, 40.0]
+        })
+        result = PositionSizer.batch_size(df, self.account_value)
+        self.assertEqual(result['position_size'].tolist()[1], 0)
 
 
 if __name__ == '__main__':
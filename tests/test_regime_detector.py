@@ -4,6 +4,7 @@ import numpy as np
 from datetime import datetime
 
 from src.regime_detector import RegimeDetector
+from src._numba_kernels import _sma_and_slope_loop, _sma_and_slope_np
 
 class TestRegimeDetector:
     @pytest.fixture
@@ -119,4 +120,16 @@ class TestRegimeDetector:
         assert 'regime' in result.columns
         
         # All regimes should be neutral (insufficient data)
-        assert (result['regime'] == 'neutral').all()
\ No newline at end of file
+        assert (result['regime'] == 'neutral').all()
+    
+    def test_sma_and_slope_kernels_match_pandas(self):
+        close = np.linspace(100, 160, 120) + np.sin(np.arange(120))
+        close[30] = np.nan
+        
+        expected_sma = pd.Series(close).rolling(50).mean()
+        expected_slope = RegimeDetector.calculate_trend_slope(expected_sma, lookback=10)
+        
+        for kernel in (_sma_and_slope_loop, _sma_and_slope_np):
+            sma, slope = kernel(close, 50, 10)
+            np.testing.assert_allclose(sma, expected_sma.to_numpy(), equal_nan=True)
+            np.testing.assert_allclose(slope, expected_slope.to_numpy(), equal_nan=True)
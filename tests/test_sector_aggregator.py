@@ -3,7 +3,7 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 
-from src.sector_aggregator import SectorAggregator
+from src.sector_aggregator import SectorAggregator, SECTOR_COLUMNS
 
 class TestSectorAggregator:
     @pytest.fixture
@@ -101,4 +101,10 @@ class TestSectorAggregator:
         
         # Should handle missing columns gracefully
         assert pd.isna(result['sector_rvol'].iloc[0])
-        assert result['sector_breadth'].iloc[0] == 0.0
\ No newline at end of file
+        assert result['sector_breadth'].iloc[0] == 0.0
+    
+    def test_empty_input(self, sample_stock_data):
+        result = SectorAggregator.aggregate_sectors(sample_stock_data.iloc[:0])
+        
+        assert result.empty
+        assert list(result.columns) == SECTOR_COLUMNS
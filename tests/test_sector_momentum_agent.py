@@ -3,7 +3,7 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 
-from src.sector_momentum_agent import SectorMomentumAgent, SectorMetrics
+from src.sector_momentum_agent import SectorMomentumAgent, SectorMetrics, SECTOR_METRICS_COLUMNS
 
 class TestSectorMomentumAgent:
     @pytest.fixture
@@ -151,6 +151,36 @@ class TestSectorMomentumAgent:
             assert isinstance(metrics.breadth_score, float)
             assert isinstance(metrics.rvol_score, float)
     
+    def test_run_as_frame_matches_dict(self, sample_sector_data, sample_index_data):
+        """Test the DataFrame output carries the same metrics as the dict output"""
+        results = SectorMomentumAgent.run(sample_sector_data, sample_index_data)
+        frame = SectorMomentumAgent.run(sample_sector_data, sample_index_data, as_frame=True)
+        
+        assert list(frame.columns) == SECTOR_METRICS_COLUMNS
+        assert set(frame['sector']) == set(results)
+        for row in frame.itertuples(index=False):
+            metrics = results[row.sector]
+            assert row.sector_score == metrics.sector_score
+            assert row.relative_performance == pytest.approx(metrics.relative_performance)
+            assert row.breadth_score == pytest.approx(metrics.breadth_score)
+            assert row.rvol_score == pytest.approx(metrics.rvol_score)
+    
+    def test_unsorted_rows_use_latest_dates(self, sample_sector_data):
+        """Test tails follow date order rather than row order"""
+        sector_df = sample_sector_data.copy()
+        # Technology rallies over the last 10 days
+        late = (sector_df['sector'] == 'Technology') & (sector_df['date'] >= '2024-01-16')
+        sector_df.loc[late, 'sector_close'] = 110.0
+        
+        shuffled = sector_df.sample(frac=1, random_state=0)
+        index_df = pd.DataFrame({'close': [200.0] * 25})
+        
+        expected = SectorMomentumAgent.calculate_relative_performance(sector_df, index_df, lookback=20)
+        rel_perf = SectorMomentumAgent.calculate_relative_performance(shuffled, index_df, lookback=20)
+        
+        assert rel_perf == pytest.approx(expected)
+        assert rel_perf['Technology'] == pytest.approx(0.10)
+    
     def test_insufficient_data_handling(self):
         """Test handling of insufficient data"""
         minimal_sector_data = pd.DataFrame({
@@ -121,6 +121,10 @@ class TestIndianMarketConfig(unittest.TestCase):
         self.assertEqual(IndianSectorMapper.get_sector('TCS'), 'IT')
         self.assertEqual(IndianSectorMapper.get_sector('HDFCBANK'), 'Banking')
         
+        # Exchange suffixes resolve to the same sector
+        self.assertEqual(IndianSectorMapper.get_sector('RELIANCE.NS'), 'Energy')
+        self.assertEqual(IndianSectorMapper.get_sector('TCS.BO'), 'IT')
+        
         # Test unknown symbol
         self.assertEqual(IndianSectorMapper.get_sector('UNKNOWN'), 'Others')
     
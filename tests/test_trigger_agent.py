@@ -3,7 +3,10 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 
-from src.trigger_agent import TriggerAgent, TriggerSignals
+from src.trigger_agent import (
+    BarSeries, TriggerAgent, TriggerAgentStream, TriggerSignals, TriggerStreamRegistry,
+    _volume_ratio_loop, _base_high_loop, _close_position_loop, _trigger_metrics_loop
+)
 
 class TestTriggerAgent:
     @pytest.fixture
@@ -186,4 +189,203 @@ class TestTriggerAgent:
         metrics = result['metrics']
         assert 'volume_ratio' in metrics
         assert 'breakout_percentage' in metrics
-        assert 'close_position' in metrics
\ No newline at end of file
+        assert 'close_position' in metrics
+    
+    def test_run_all_matches_run_per_bar(self):
+        """Test the vectorized per-bar pass matches run() and the scalar detectors on each prefix"""
+        rng = np.random.default_rng(7)
+        close = 100 + np.cumsum(rng.normal(0, 1, 40))
+        data = pd.DataFrame({
+            'high': close + rng.uniform(0, 2, 40),
+            'low': close - rng.uniform(0, 2, 40),
+            'close': close,
+            'volume': rng.integers(500000, 3000000, 40).astype(float)
+        })
+        data.loc[30, ['high', 'volume']] = [close[:30].max() + 10, 1e7]  # trigger bar
+        gapped = data.copy()
+        gapped.loc[[5, 22, 27], 'volume'] = np.nan  # missing prints inside the volume window
+        gapped.loc[25, 'high'] = np.nan  # missing high inside the trigger bar's base
+        
+        for frame in (data, gapped):
+            per_bar = TriggerAgent.run_all(frame)
+            
+            assert per_bar['trigger_active'].iloc[30]
+            assert per_bar['breakout_from_base'].iloc[30]
+            for i in range(len(frame)):
+                history = frame.iloc[:i + 1]
+                result = TriggerAgent.run(history)
+                row = per_bar.iloc[i]
+                assert row['trigger_active'] == result['trigger_active']
+                assert row['volume_expansion'] == result['signals'].volume_expansion
+                assert row['breakout_from_base'] == result['signals'].breakout_from_base
+                assert row['candle_acceptance'] == result['signals'].candle_acceptance
+                for name, value in result['metrics'].items():
+                    assert row[name] == pytest.approx(value, nan_ok=True)
+                
+                if len(history) < 25:
+                    continue
+                expansion, volume_ratio = TriggerAgent.detect_volume_expansion(history)
+                breakout, breakout_percentage = TriggerAgent.detect_breakout_from_base(history)
+                acceptance, close_position = TriggerAgent.detect_candle_acceptance(history)
+                assert result['signals'] == TriggerSignals(expansion, breakout, acceptance)
+                assert result['metrics'] == pytest.approx({
+                    'volume_ratio': volume_ratio,
+                    'breakout_percentage': breakout_percentage,
+                    'close_position': close_position
+                }, nan_ok=True)
+    
+    def test_bar_series_matches_frame(self):
+        """Test run/run_all give the same results from a BarSeries as from the frame"""
+        rng = np.random.default_rng(11)
+        close = 100 + np.cumsum(rng.normal(0, 1, 30))
+        data = pd.DataFrame({
+            'open': close,
+            'high': close + rng.uniform(0, 2, 30),
+            'low': close - rng.uniform(0, 2, 30),
+            'close': close,
+            'volume': rng.integers(500000, 3000000, 30)
+        })
+        bars = BarSeries.from_frame(data)
+        
+        assert bars.n_bars == 30
+        assert bars.volume.dtype == np.float64
+        pd.testing.assert_frame_equal(TriggerAgent.run_all(bars), TriggerAgent.run_all(data))
+        for i in (10, 25, 30):
+            assert TriggerAgent.run(bars.tail(i)) == TriggerAgent.run(data.tail(i))
+    
+    def test_stream_matches_run_per_bar(self):
+        """Test the incremental stream reproduces run() bar by bar"""
+        rng = np.random.default_rng(11)
+        close = 100 + np.cumsum(rng.normal(0, 1, 40))
+        data = pd.DataFrame({
+            'high': close + rng.uniform(0, 2, 40),
+            'low': close - rng.uniform(0, 2, 40),
+            'close': close,
+            'volume': rng.integers(500000, 3000000, 40).astype(float)
+        })
+        data.loc[30, ['high', 'volume']] = [close[:30].max() + 10, 1e7]  # trigger bar
+        gapped = data.copy()
+        gapped.loc[[5, 22, 27], 'volume'] = np.nan  # NaNs enter and leave the window
+        gapped.loc[[3, 25], 'high'] = np.nan  # missing highs in and before the trigger bar's base
+        
+        for frame in (data, gapped):
+            stream = TriggerAgentStream()
+            for i, bar in enumerate(frame.to_dict('records')):
+                streamed = stream.push(bar)
+                expected = TriggerAgent.run(frame.iloc[:i + 1])
+                assert streamed['trigger_active'] == expected['trigger_active']
+                assert streamed['signals'] == expected['signals']
+                assert streamed['metrics'] == pytest.approx(expected['metrics'], nan_ok=True)
+                if i == 30:
+                    assert streamed['signals'].volume_expansion
+                    assert streamed['signals'].breakout_from_base
+    
+    def test_stream_registry_matches_run_per_symbol(self):
+        """Test day-by-day multi-symbol streaming matches run() on each symbol's history"""
+        rng = np.random.default_rng(13)
+        frames = []
+        for symbol in ('AAA', 'BBB'):
+            close = 100 + np.cumsum(rng.normal(0, 1, 30))
+            frames.append(pd.DataFrame({
+                'date': pd.date_range('2024-01-01', periods=30),
+                'symbol': symbol,
+                'high': close + rng.uniform(0, 2, 30),
+                'low': close - rng.uniform(0, 2, 30),
+                'close': close,
+                'volume': rng.integers(500000, 3000000, 30).astype(float)
+            }))
+        data = pd.concat(frames, ignore_index=True)
+        
+        registry = TriggerStreamRegistry()
+        for date, day in data.groupby('date'):
+            results = registry.push_day(day)
+            for symbol, streamed in results.items():
+                history = data[(data['symbol'] == symbol) & (data['date'] <= date)]
+                expected = TriggerAgent.run(history)
+                assert streamed['signals'] == expected['signals']
+                assert streamed['metrics'] == pytest.approx(expected['metrics'])
+        
+        assert 'AAA' in registry
+        registry.reset('AAA')
+        assert 'AAA' not in registry
+    
+    def test_kernel_loops_match_numpy_paths(self):
+        """Test the JIT kernel loops agree with the vectorized NumPy paths"""
+        rng = np.random.default_rng(5)
+        close = 100 + np.cumsum(rng.normal(0, 1, 60))
+        high = close + rng.uniform(0, 2, 60)
+        low = close - rng.uniform(0, 2, 60)
+        low[12] = high[12]  # zero-range bar
+        high[30] = np.nan  # skipped by the base high, not propagated
+        volume = rng.integers(500000, 3000000, 60).astype(float)
+        volume[40] = np.nan
+        
+        avg_volume = TriggerAgent._rolling_mean(volume, 20)
+        candle_range = high - low
+        with np.errstate(divide='ignore', invalid='ignore'):
+            expected_ratio = np.where(avg_volume > 0, volume / avg_volume, 0.0)
+            expected_position = np.where(candle_range != 0, (close - low) / candle_range, 0.0)
+        
+        np.testing.assert_allclose(_volume_ratio_loop(volume, 20), expected_ratio)
+        np.testing.assert_allclose(_base_high_loop(high, 20), TriggerAgent._rolling_max_shift1(high, 20))
+        np.testing.assert_allclose(_close_position_loop(high, low, close), expected_position)
+    
+    def test_rolling_max_skips_nan_highs(self):
+        """Test the NumPy base high skips NaN highs like the scalar max()"""
+        high = np.arange(30, dtype=float)
+        high[[22, 24]] = np.nan
+        high[:4] = np.nan
+        
+        expected = np.full(30, np.nan)
+        for i in range(3, 30):
+            expected[i] = pd.Series(high[i - 3:i]).max()
+        
+        np.testing.assert_array_equal(TriggerAgent._rolling_max_shift1(high, 3), expected)
+    
+    def test_fused_kernel_matches_single_metric_loops(self):
+        """Test the one-sweep trigger kernel agrees with the per-metric loops"""
+        rng = np.random.default_rng(9)
+        close = 100 + np.cumsum(rng.normal(0, 1, 80))
+        high = close + rng.uniform(0, 2, 80)
+        low = close - rng.uniform(0, 2, 80)
+        high[50] = np.nan
+        volume = rng.integers(500000, 3000000, 80).astype(float)
+        volume[30] = np.nan
+        
+        volume_ratio, base_high, close_position = _trigger_metrics_loop(high, low, close, volume, 20, 20)
+        
+        assert not np.isnan(base_high[51:71]).any()
+        np.testing.assert_allclose(volume_ratio, _volume_ratio_loop(volume, 20))
+        np.testing.assert_allclose(base_high, _base_high_loop(high, 20))
+        np.testing.assert_allclose(close_position, _close_position_loop(high, low, close))
+    
+    def test_run_universe_matches_run_all_per_symbol(self):
+        """Test multi-symbol scoring matches scoring each symbol on its own"""
+        rng = np.random.default_rng(3)
+        frames = []
+        for symbol, n in [('AAA', 40), ('BBB', 35), ('CCC', 10)]:
+            close = 100 + np.cumsum(rng.normal(0, 1, n))
+            frames.append(pd.DataFrame({
+                'symbol': symbol,
+                'date': pd.date_range('2024-01-01', periods=n),
+                'high': close + rng.uniform(0, 2, n),
+                'low': close - rng.uniform(0, 2, n),
+                'close': close,
+                'volume': rng.integers(500000, 3000000, n).astype(float)
+            }))
+        data = pd.concat(frames, ignore_index=True).sample(frac=1, random_state=0)
+        
+        result = TriggerAgent.run_universe(data)
+        
+        assert result.index.equals(data.index)
+        for _, symbol_data in data.groupby('symbol'):
+            expected = TriggerAgent.run_all(symbol_data.sort_values('date'))
+            pd.testing.assert_frame_equal(result.loc[expected.index], expected)
+        
+        # Rows without a symbol are kept, unscored
+        unlabeled = data.copy()
+        unlabeled.loc[unlabeled.index[:5], 'symbol'] = np.nan
+        result = TriggerAgent.run_universe(unlabeled)
+        
+        assert result.index.equals(unlabeled.index)
+        assert not result.loc[unlabeled['symbol'].isna()].to_numpy().any()
@@ -63,6 +63,17 @@ class TestWalkForwardTester(unittest.TestCase):
         # Should contain both symbols
         self.assertEqual(set(filtered['symbol']), {'AAPL', 'MSFT'})
     
+    def test_filter_data_sorted_slice_matches_mask(self):
+        """Test binary-search slicing of date-sorted data matches the mask filter."""
+        sorted_data = self.test_data.sort_values('date', kind='stable')
+        
+        expected = self.tester._filter_data(self.test_data, '2023-02-01', '2023-02-28')
+        sliced = self.tester._filter_data(
+            sorted_data, '2023-02-01', '2023-02-28', pd.Index(sorted_data['date'])
+        )
+        
+        pd.testing.assert_frame_equal(sliced.sort_index(), expected.sort_index())
+    
     def test_simulate_backtest_results(self):
         """Test backtest simulation."""
         sample_data = self.test_data.head(20)
@@ -79,6 +90,26 @@ class TestWalkForwardTester(unittest.TestCase):
         for trade in results['trades']:
             self.assertTrue(hasattr(trade, 'pnl'))
     
+    def test_simulated_trades_seeded_and_compounding(self):
+        """Test seeded simulations repeat and trade P&L compounds into the final value."""
+        sample_data = self.test_data[self.test_data['date'] <= '2023-03-31']
+        
+        first = WalkForwardTester(60, 20, 10, seed=42)._simulate_backtest_results(sample_data, self.frozen_params)
+        second = WalkForwardTester(60, 20, 10, seed=42)._simulate_backtest_results(sample_data, self.frozen_params)
+        
+        pnls = [trade.pnl for trade in first['trades']]
+        self.assertGreater(len(pnls), 1)
+        self.assertEqual(pnls, [trade.pnl for trade in second['trades']])
+        
+        # Each trade risks 1% of the value compounded so far
+        value = 100000
+        for pnl in pnls:
+            self.assertTrue(abs(pnl) >= value * 0.01 - 1e-9)
+            value += pnl
+        last_point = first['equity_curve']['total_value'].iat[-1]
+        n_dates = len(first['equity_curve'])
+        self.assertAlmostEqual(last_point, 100000 + (value - 100000) * (n_dates - 1) / n_dates)
+    
     def test_aggregate_window_kpis(self):
         """Test KPI aggregation across windows."""
         # Mock window results
@@ -128,6 +159,41 @@ class TestWalkForwardTester(unittest.TestCase):
         metrics = self.tester._calculate_robustness_metrics([])
         self.assertEqual(metrics, {})
     
+    def test_frozen_params_seed_reproducible(self):
+        """Test a seed in the frozen parameters fixes results regardless of the tester seed."""
+        params = {**self.frozen_params, 'seed': 11}
+        first = WalkForwardTester(60, 20, 10, seed=1).run_walk_forward(
+            self.test_data, '2023-01-01', '2023-06-30', params
+        )
+        second = WalkForwardTester(60, 20, 10).run_walk_forward(
+            self.test_data, '2023-01-01', '2023-06-30', params
+        )
+        
+        self.assertGreater(first['total_windows'], 1)
+        self.assertEqual(
+            [w['final_value'] for w in first['window_results']],
+            [w['final_value'] for w in second['window_results']]
+        )
+    
+    def test_parallel_folds_match_serial(self):
+        """Test seeded walk-forward results do not depend on the worker count."""
+        serial = WalkForwardTester(60, 20, 10, seed=7).run_walk_forward(
+            self.test_data, '2023-01-01', '2023-06-30', self.frozen_params, max_workers=1
+        )
+        parallel = WalkForwardTester(60, 20, 10, seed=7).run_walk_forward(
+            self.test_data, '2023-01-01', '2023-06-30', self.frozen_params, max_workers=4
+        )
+        
+        self.assertGreater(serial['total_windows'], 1)
+        self.assertEqual(
+            [w['window_id'] for w in parallel['window_results']],
+            [w['window_id'] for w in serial['window_results']]
+        )
+        self.assertEqual(
+            [w['final_value'] for w in parallel['window_results']],
+            [w['final_value'] for w in serial['window_results']]
+        )
+    
     @patch('src.walk_forward_tester.KPIComputer.compute_kpis')
     def test_run_walk_forward(self, mock_compute_kpis):
         """Test complete walk-forward execution."""